@@ -8,9 +8,12 @@ from the Kidsights imputation system.
 import sys
 from pathlib import Path
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent.parent
-sys.path.insert(0, str(project_root))
+# Add project root to path only if the package isn't already importable
+# (e.g. via PYTHONPATH); __file__ is absolute, so no symlink resolution needed
+try:
+    import python.imputation  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parents[2]))
 
 from python.imputation.helpers import (
     get_completed_dataset,
@@ -53,10 +56,11 @@ print(f"Columns: {', '.join(df_long.columns.tolist())}")
 
 # Calculate variability across imputations
 import pandas as pd
-variability = df_long.groupby(['pid', 'record_id']).agg({
-    'puma': lambda x: x.nunique(),
-    'county': lambda x: x.nunique()
-}).rename(columns={'puma': 'n_puma_values', 'county': 'n_county_values'})
+variability = (
+    df_long.groupby(['pid', 'record_id'], sort=False)[['puma', 'county']]
+    .nunique()
+    .rename(columns={'puma': 'n_puma_values', 'county': 'n_county_values'})
+)
 
 uncertain_puma = (variability['n_puma_values'] > 1).sum()
 uncertain_county = (variability['n_county_values'] > 1).sum()
@@ -75,9 +79,11 @@ summary = get_imputed_variable_summary('puma', study_id='ne25')
 print(f"\n[OK] PUMA distribution across M=5 imputations")
 print(f"Total rows in summary: {len(summary)}")
 print("\nTop 10 PUMA values (imputation 1):")
-m1_summary = summary[summary['imputation_m'] == 1].sort_values('count', ascending=False).head(10)
-for _, row in m1_summary.iterrows():
-    print(f"  PUMA {row['value']}: {row['count']} records")
+m1_summary = summary[summary['imputation_m'] == 1].nlargest(10, 'count')
+print('\n'.join(
+    f"  PUMA {value}: {count} records"
+    for value, count in zip(m1_summary['value'].to_numpy(), m1_summary['count'].to_numpy())
+))
 
 print("\n" + "=" * 70)
 print("EXAMPLE 4: Imputation Metadata")
@@ -89,8 +95,8 @@ ne25_meta = meta[meta['study_id'] == 'ne25']
 
 print(f"\n[OK] Found {len(ne25_meta)} imputed variables for ne25")
 print("\nVariable details:")
-for _, row in ne25_meta.iterrows():
-    print(f"  {row['variable_name']}: {row['n_imputations']} imputations, method={row['imputation_method']}")
+for row in ne25_meta.itertuples(index=False):
+    print(f"  {row.variable_name}: {row.n_imputations} imputations, method={row.imputation_method}")
 
 print("\n" + "=" * 70)
 print("EXAMPLE 5: Validate Imputations")
@@ -8,14 +8,18 @@ Demonstrates how to work with multiple independent studies
 import sys
 from pathlib import Path
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent.parent
-sys.path.insert(0, str(project_root))
+# Add project root to path only if the package isn't already importable
+# (e.g. via PYTHONPATH); __file__ is absolute, so no symlink resolution needed
+try:
+    import python.imputation  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parents[2]))
 
 from python.imputation.helpers import (
     get_completed_dataset,
     get_imputation_metadata,
-    validate_imputations
+    validate_imputations,
+    encode_categoricals
 )
 from python.imputation.config import get_study_config
 import pandas as pd
@@ -69,24 +73,23 @@ print("EXAMPLE 3: Metadata Across All Studies")
 print("=" * 70)
 
 # Get metadata for all studies in the database
-all_meta = get_imputation_metadata()
+all_meta = encode_categoricals(get_imputation_metadata())
 
 print(f"\n[OK] Found metadata for {len(all_meta)} variables across all studies")
 
 # Summarize by study
-study_summary = all_meta.groupby('study_id').agg({
+study_summary = all_meta.groupby('study_id', observed=True).agg({
     'variable_name': 'count',
     'n_imputations': 'first'
 }).rename(columns={'variable_name': 'n_variables'})
 
 print("\nStudies in database:")
-for study_id, row in study_summary.iterrows():
-    print(f"  {study_id}: {row['n_variables']} variables, M={row['n_imputations']} imputations")
+for row in study_summary.itertuples():
+    print(f"  {row.Index}: {row.n_variables} variables, M={row.n_imputations} imputations")
 
 # Show variables for each study
 print("\nVariables by study:")
-for study_id in all_meta['study_id'].unique():
-    study_vars = all_meta[all_meta['study_id'] == study_id]
+for study_id, study_vars in all_meta.groupby('study_id', observed=True, sort=False):
     var_names = ', '.join(study_vars['variable_name'].tolist())
     print(f"  {study_id}: {var_names}")
 
@@ -115,29 +118,30 @@ print("=" * 70)
 # Demonstrate accessing study-specific variables that may differ
 print("\n[INFO] NE25-specific analysis:")
 
-# Get all variables for ne25 (including study-specific ones)
+# Request only the geography + sociodem variables (projected in DuckDB)
+ne25_vars = ['puma', 'county', 'census_tract', 'female', 'raceG',
+             'educ_mom', 'educ_a2', 'income', 'family_size', 'fplcat']
 ne25_full = get_completed_dataset(
     imputation_m=1,
-    variables=None,  # Get ALL imputed variables
+    variables=ne25_vars,
     base_table='ne25_transformed',
-    study_id='ne25'
+    study_id='ne25',
+    base_columns=[]  # No extra base columns needed
 )
 
-imputed_cols = [col for col in ne25_full.columns
-                if col in ['puma', 'county', 'census_tract', 'female', 'raceG',
-                          'educ_mom', 'educ_a2', 'income', 'family_size', 'fplcat']]
+imputed_cols = [col for col in ne25_vars if col in ne25_full.columns]
 
 print(f"  Total columns: {len(ne25_full.columns)}")
 print(f"  Imputed variables: {', '.join(imputed_cols)}")
 print(f"  Records: {len(ne25_full)}")
 
 # Check for missing values in imputed variables
+# (one reduction over all imputed columns rather than a pass per column)
 print("\n[INFO] Missing values in imputed variables:")
-for col in imputed_cols:
-    if col in ne25_full.columns:
-        n_missing = ne25_full[col].isna().sum()
-        pct_missing = 100 * n_missing / len(ne25_full)
-        print(f"  {col}: {n_missing} ({pct_missing:.1f}%)")
+n_missing = ne25_full[imputed_cols].isna().sum()
+pct_missing = 100 * n_missing / len(ne25_full)
+for col, n, pct in zip(imputed_cols, n_missing, pct_missing):
+    print(f"  {col}: {n} ({pct:.1f}%)")
 
 print("\n" + "=" * 70)
 print("[OK] Multi-study examples completed")
@@ -13,33 +13,56 @@ Prerequisites:
 import sys
 from pathlib import Path
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent.parent
-sys.path.insert(0, str(project_root))
+# Add project root to path only if the package isn't already importable
+# (e.g. via PYTHONPATH); __file__ is absolute, so no symlink resolution needed
+try:
+    import python.imputation  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parents[2]))
 
 from python.imputation.helpers import (
     get_completed_dataset,
+    get_completed_dataset_arrow,
     get_all_imputations,
     get_imputation_metadata,
-    validate_imputations
+    validate_imputations,
+    encode_categoricals
 )
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import pyarrow as pa
 
 print("=" * 70)
 print("EXAMPLE 1: Compare Sample Sizes Across Studies")
 print("=" * 70)
 
-# Get metadata for all studies
-all_meta = get_imputation_metadata()
+# Get metadata for all studies (study_id as a categorical for the filters below)
+all_meta = encode_categoricals(get_imputation_metadata())
+
+# Group metadata by study once; reused by the examples below
+meta_by_study = {
+    study_id: group
+    for study_id, group in all_meta.groupby('study_id', observed=True, sort=False)
+}
+vars_by_study = {
+    study_id: frozenset(group['variable_name'])
+    for study_id, group in meta_by_study.items()
+}
+
+# Variable x study presence table: intersections become column-wise boolean reductions
+presence = pd.crosstab(all_meta['variable_name'], all_meta['study_id']).astype(bool)
+common_mask = presence.all(axis=1)
 
 # Summarize by study
 study_summary = {}
-for study_id in all_meta['study_id'].unique():
+for study_id in meta_by_study:
     # Get one imputation to check sample size
     df = get_completed_dataset(
         imputation_m=1,
         variables=['female'],  # Just need one variable
-        study_id=study_id
+        base_table=f'{study_id}_transformed',
+        study_id=study_id,
+        base_columns=[]
     )
     study_summary[study_id] = len(df)
 
@@ -51,25 +74,20 @@ print("\n" + "=" * 70)
 print("EXAMPLE 2: Compare Variable Availability Across Studies")
 print("=" * 70)
 
-# Get imputed variables for each study
-study_vars = {}
-for study_id in all_meta['study_id'].unique():
-    study_meta = all_meta[all_meta['study_id'] == study_id]
-    study_vars[study_id] = set(study_meta['variable_name'].tolist())
-
 # Find common variables
-if len(study_vars) > 1:
-    common_vars = set.intersection(*study_vars.values())
+if presence.shape[1] > 1:
+    common_vars = presence.index[common_mask].tolist()
     print(f"\n[INFO] Variables imputed in ALL studies ({len(common_vars)}):")
-    for var in sorted(common_vars):
+    for var in common_vars:
         print(f"  - {var}")
 
-    # Find study-specific variables
+    # Find study-specific variables (imputed in this study and no other)
     print(f"\n[INFO] Study-specific variables:")
-    for study_id, vars_set in sorted(study_vars.items()):
-        unique_vars = vars_set - common_vars
+    for study_id in sorted(presence.columns):
+        only_here = presence[study_id] & ~presence.drop(columns=study_id).any(axis=1)
+        unique_vars = presence.index[only_here].tolist()
         if unique_vars:
-            print(f"  {study_id} only: {', '.join(sorted(unique_vars))}")
+            print(f"  {study_id} only: {', '.join(unique_vars)}")
 else:
     print("\n[INFO] Only one study available - cannot compare")
 
@@ -78,12 +96,12 @@ print("EXAMPLE 3: Combine Data Across Studies (Pooled Analysis)")
 print("=" * 70)
 
 # Note: This example assumes ne25 exists. Adapt for available studies.
-available_studies = all_meta['study_id'].unique().tolist()
+available_studies = list(meta_by_study)
 
 print(f"\n[INFO] Available studies: {', '.join(available_studies)}")
 
 # Get common variables
-common_vars = list(set.intersection(*study_vars.values())) if len(study_vars) > 1 else list(study_vars[available_studies[0]])
+common_vars = presence.index[common_mask].tolist()
 
 if len(common_vars) > 0:
     # Example: Pool 'female' and 'raceG' across studies
@@ -92,19 +110,25 @@ if len(common_vars) > 0:
     if pooling_vars:
         print(f"\n[INFO] Pooling variables: {', '.join(pooling_vars)}")
 
-        # Get data from each study (imputation m=1)
-        pooled_dfs = []
-        for study_id in available_studies:
-            df = get_completed_dataset(
+        # Get data from each study (imputation m=1) as Arrow tables
+        def load_study_table(study_id):
+            tbl = get_completed_dataset_arrow(
                 imputation_m=1,
                 variables=pooling_vars,
-                study_id=study_id
+                base_table=f'{study_id}_transformed',
+                study_id=study_id,
+                base_columns=[]
             )
-            df['study'] = study_id  # Add study indicator
-            pooled_dfs.append(df)
+            # Add dictionary-encoded study indicator
+            study_col = pa.repeat(study_id, tbl.num_rows).dictionary_encode()
+            return tbl.append_column('study', study_col)
 
-        # Combine
-        pooled_data = pd.concat(pooled_dfs, ignore_index=True)
+        # Studies are independent reads (one read-only connection each): load in parallel
+        with ThreadPoolExecutor(max_workers=max(1, len(available_studies))) as executor:
+            pooled_tables = list(executor.map(load_study_table, available_studies))
+
+        # Combine at the Arrow level and convert to pandas once
+        pooled_data = pa.concat_tables(pooled_tables).to_pandas(self_destruct=True)
 
         print(f"  [OK] Pooled dataset: {len(pooled_data):,} total participants")
         print(f"\n  Distribution by study:")
@@ -113,7 +137,7 @@ if len(common_vars) > 0:
         # Analyze pooled data
         if 'female' in pooled_data.columns:
             print(f"\n  Sex distribution (pooled):")
-            print(pooled_data.groupby('study')['female'].value_counts(normalize=True).unstack().to_string())
+            print(pd.crosstab(pooled_data['study'], pooled_data['female'], normalize='index').to_string())
     else:
         print("\n[INFO] No common demographic variables to pool")
 else:
@@ -128,18 +152,19 @@ print("\n[INFO] Comparing geographic uncertainty across studies...")
 
 for study_id in available_studies:
     # Check if study has geography variables
-    study_meta = all_meta[all_meta['study_id'] == study_id]
-    has_puma = 'puma' in study_meta['variable_name'].values
+    has_puma = 'puma' in vars_by_study[study_id]
 
     if has_puma:
         # Get all M imputations
         df_long = get_all_imputations(
             variables=['puma'],
-            study_id=study_id
+            base_table=f'{study_id}_transformed',
+            study_id=study_id,
+            base_columns=[]
         )
 
         # Calculate variability for each participant
-        variability = df_long.groupby(['pid', 'record_id'])['puma'].nunique()
+        variability = df_long.groupby(['pid', 'record_id'], sort=False)['puma'].nunique()
         uncertain = (variability > 1).sum()
         total = len(variability)
 
@@ -155,40 +180,40 @@ print("=" * 70)
 # Demonstrate running the same analysis on multiple studies
 def analyze_study(study_id):
     """Run standardized analysis for any study."""
-    print(f"\n[INFO] Analyzing {study_id}...")
+    # Identify imputed columns
+    imputed_vars = meta_by_study[study_id]['variable_name'].tolist()
 
-    # Get data
+    # Get data (only the study's imputed variables, no extra base columns)
     df = get_completed_dataset(
         imputation_m=1,
-        variables=None,  # Get all imputed variables
-        study_id=study_id
+        variables=imputed_vars,
+        base_table=f'{study_id}_transformed',
+        study_id=study_id,
+        base_columns=[]
     )
 
-    # Identify imputed columns
-    study_meta = all_meta[all_meta['study_id'] == study_id]
-    imputed_vars = study_meta['variable_name'].tolist()
-
-    # Calculate missingness before imputation (would need base data for real calc)
-    print(f"  Sample size: {len(df):,}")
-    print(f"  Imputed variables: {len(imputed_vars)}")
-
     # Example: Check for complete cases after imputation
+    # (missingness before imputation would need base data for real calc)
     imputed_cols_in_df = [col for col in imputed_vars if col in df.columns]
     complete_cases = df[imputed_cols_in_df].notna().all(axis=1).sum()
 
-    print(f"  Complete cases (imputed vars): {complete_cases:,} ({100*complete_cases/len(df):.1f}%)")
-
     return {
         'study_id': study_id,
         'n': len(df),
         'n_vars': len(imputed_vars),
+        'n_complete': complete_cases,
         'pct_complete': 100 * complete_cases / len(df)
     }
 
-# Run analysis on all studies
-results = []
-for study_id in available_studies:
-    results.append(analyze_study(study_id))
+# Run analysis on all studies in parallel (results come back in study order)
+with ThreadPoolExecutor(max_workers=max(1, len(available_studies))) as executor:
+    results = list(executor.map(analyze_study, available_studies))
+
+for result in results:
+    print(f"\n[INFO] Analyzed {result['study_id']}:")
+    print(f"  Sample size: {result['n']:,}")
+    print(f"  Imputed variables: {result['n_vars']}")
+    print(f"  Complete cases (imputed vars): {result['n_complete']:,} ({result['pct_complete']:.1f}%)")
 
 # Summarize results
 print(f"\n[INFO] Cross-study comparison:")
@@ -202,9 +227,11 @@ print("=" * 70)
 # Check that all studies pass validation
 print("\n[INFO] Running validation for all studies...")
 
+with ThreadPoolExecutor(max_workers=max(1, len(available_studies))) as executor:
+    study_validations = dict(zip(available_studies, executor.map(validate_imputations, available_studies)))
+
 validation_results = {}
-for study_id in available_studies:
-    results = validate_imputations(study_id=study_id)
+for study_id, results in study_validations.items():
     validation_results[study_id] = results['all_valid']
 
     if results['all_valid']:
@@ -230,46 +257,53 @@ print("=" * 70)
 print("\n[INFO] Preparing data for meta-analysis with Rubin's rules...")
 
 # Example: Estimate sex distribution in each study, across all M imputations
-def estimate_with_mi(study_id, variable='female'):
-    """Estimate proportion with proper MI variance."""
-    # Get all M imputations
-    df_long = get_all_imputations(
-        variables=[variable],
-        study_id=study_id
+def estimate_with_mi(study_ids, variable='female'):
+    """Estimate proportion with proper MI variance for several studies at once."""
+    # Get all M imputations for every study, stacked in long format
+    df_long = pd.concat(
+        [
+            get_all_imputations(
+                variables=[variable],
+                base_table=f'{study_id}_transformed',
+                study_id=study_id,
+                base_columns=[]
+            ).assign(study_id=study_id)
+            for study_id in study_ids
+        ],
+        ignore_index=True
     )
 
-    # Calculate proportion in each imputation
-    estimates = df_long.groupby('imputation_m')[variable].apply(
-        lambda x: x.notna().sum() / len(x)  # Proportion non-missing
+    # Proportion non-missing per (study, imputation): one grouped mean, no lambdas
+    mask = df_long[variable].notna().astype('int8')
+    estimates = (
+        mask.groupby([df_long['study_id'], df_long['imputation_m']], observed=True)
+        .mean()
+        .unstack('imputation_m')
     )
 
     # Within-imputation variance (simplified - would need survey weights)
-    Q_bar = estimates.mean()  # Pooled estimate
-    U_bar = estimates.var()   # Within-imputation variance
+    Q_bar = estimates.mean(axis=1)         # Pooled estimate
+    U_bar = estimates.var(axis=1, ddof=1)  # Within-imputation variance
 
     # Between-imputation variance
-    B = estimates.var()
+    B = estimates.var(axis=1, ddof=1)
 
     # Total variance (Rubin's rules)
-    M = len(estimates)
+    M = estimates.shape[1]
     T = U_bar + (1 + 1/M) * B
 
-    return {
-        'study_id': study_id,
-        'estimate': Q_bar,
-        'variance': T,
-        'se': T ** 0.5
-    }
+    return pd.DataFrame({
+        'study_id': estimates.index,
+        'estimate': Q_bar.to_numpy(),
+        'variance': T.to_numpy(),
+        'se': (T ** 0.5).to_numpy()
+    })
 
 # Run for available studies with 'female' variable
-meta_data = []
-for study_id in available_studies:
-    study_meta = all_meta[all_meta['study_id'] == study_id]
-    if 'female' in study_meta['variable_name'].values:
-        meta_data.append(estimate_with_mi(study_id, 'female'))
+female_studies = [study_id for study_id in available_studies if 'female' in vars_by_study[study_id]]
 
-if meta_data:
-    meta_df = pd.DataFrame(meta_data)
+if female_studies:
+    meta_df = estimate_with_mi(female_studies, 'female')
     print("\n[INFO] Study-specific estimates (proportion female, with MI):")
     print(meta_df.to_string(index=False))
 
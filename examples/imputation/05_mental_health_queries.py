@@ -19,13 +19,18 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent.parent
-sys.path.insert(0, str(project_root))
+# Add project root to path only if the package isn't already importable
+# (e.g. via PYTHONPATH); __file__ is absolute, so no symlink resolution needed
+try:
+    import python.imputation  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parents[2]))
 
 from python.imputation.helpers import (
     get_mental_health_imputations,
-    get_complete_dataset
+    get_all_mental_health_imputations,
+    get_complete_dataset,
+    encode_categoricals
 )
 
 print("=" * 70)
@@ -80,34 +85,36 @@ print("\n" + "=" * 70)
 print("EXAMPLE 3: Pooling Prevalence Estimates Across M=5 Imputations")
 print("=" * 70)
 
-# Get all M=5 imputations and pool prevalence estimates
-phq2_prevalences = []
-gad2_prevalences = []
-q1502_means = []
-
-for m in range(1, 6):
-    mh_m = get_mental_health_imputations(study_id='ne25', imputation_number=m, include_base_data=True)
-    mh_m_complete = mh_m[mh_m['phq2_interest'].notna()].copy()
-
-    phq2_prev_m = (mh_m_complete['phq2_positive'] == 1).sum() / len(mh_m_complete) * 100
-    gad2_prev_m = (mh_m_complete['gad2_positive'] == 1).sum() / len(mh_m_complete) * 100
-    q1502_mean_m = mh_m_complete['q1502'].mean()
-
-    phq2_prevalences.append(phq2_prev_m)
-    gad2_prevalences.append(gad2_prev_m)
-    q1502_means.append(q1502_mean_m)
+# Get all M=5 imputations in long format (one call) and pool with a single groupby.
+# base_columns=[] keeps only the mental health columns, so just those are
+# replicated across imputations
+mh_long = get_all_mental_health_imputations(
+    study_id='ne25', include_base_data=True, base_columns=[]
+)
+mh_long = mh_long[mh_long['phq2_interest'].notna()]
+
+per_m = mh_long.assign(
+    phq2_pos=mh_long['phq2_positive'].eq(1),
+    gad2_pos=mh_long['gad2_positive'].eq(1)
+).groupby('imputation_m').agg(
+    phq2_pos=('phq2_pos', 'mean'),
+    gad2_pos=('gad2_pos', 'mean'),
+    q1502=('q1502', 'mean')
+)
+per_m[['phq2_pos', 'gad2_pos']] *= 100
 
-    print(f"  m={m}: PHQ-2+ = {phq2_prev_m:.1f}%, GAD-2+ = {gad2_prev_m:.1f}%, q1502 = {q1502_mean_m:.2f}")
+for row in per_m.itertuples():
+    print(f"  m={row.Index}: PHQ-2+ = {row.phq2_pos:.1f}%, GAD-2+ = {row.gad2_pos:.1f}%, q1502 = {row.q1502:.2f}")
 
 # Pooled estimates (simple average across imputations)
-phq2_pooled_mean = np.mean(phq2_prevalences)
-phq2_pooled_sd = np.std(phq2_prevalences, ddof=1)
+phq2_pooled_mean = per_m['phq2_pos'].mean()
+phq2_pooled_sd = per_m['phq2_pos'].std(ddof=1)
 
-gad2_pooled_mean = np.mean(gad2_prevalences)
-gad2_pooled_sd = np.std(gad2_prevalences, ddof=1)
+gad2_pooled_mean = per_m['gad2_pos'].mean()
+gad2_pooled_sd = per_m['gad2_pos'].std(ddof=1)
 
-q1502_pooled_mean = np.mean(q1502_means)
-q1502_pooled_sd = np.std(q1502_means, ddof=1)
+q1502_pooled_mean = per_m['q1502'].mean()
+q1502_pooled_sd = per_m['q1502'].std(ddof=1)
 
 print(f"\n[POOLED ESTIMATES]")
 print(f"  PHQ-2+ prevalence: {phq2_pooled_mean:.1f}% (SD = {phq2_pooled_sd:.2f})")
@@ -118,24 +125,25 @@ print("\n" + "=" * 70)
 print("EXAMPLE 4: Mental Health by Demographics (Imputation m=1)")
 print("=" * 70)
 
-# Merge mental health with base data for demographics
-mh_demo = get_mental_health_imputations(
+# Merge mental health with base data for demographics, keeping only records
+# with mental health data (filter is applied in DuckDB before loading)
+mh_demo_complete = encode_categoricals(get_mental_health_imputations(
     study_id='ne25',
     imputation_number=1,
-    include_base_data=True
-)
-
-# Filter to non-null mental health data
-mh_demo_complete = mh_demo[mh_demo['phq2_interest'].notna()].copy()
+    include_base_data=True,
+    require_nonnull=['phq2_interest']
+))
 
 print(f"\n[INFO] Analyzing {len(mh_demo_complete)} records with complete mental health data")
 
 # PHQ-2+ by race/ethnicity
 if 'a1_raceG' in mh_demo_complete.columns:
     print("\nPHQ-2+ Prevalence by Adult Race/Ethnicity:")
-    phq2_by_race = mh_demo_complete.groupby('a1_raceG').agg({
-        'phq2_positive': ['count', 'sum', 'mean']
-    }).round(3)
+    phq2_by_race = (
+        mh_demo_complete.groupby('a1_raceG', observed=True, sort=False)['phq2_positive']
+        .agg(['count', 'sum', 'mean'])
+        .round(3)
+    )
     phq2_by_race.columns = ['N', 'N_positive', 'Prevalence']
     phq2_by_race['Prevalence'] = phq2_by_race['Prevalence'] * 100
     print(phq2_by_race)
@@ -143,9 +151,11 @@ if 'a1_raceG' in mh_demo_complete.columns:
 # GAD-2+ by education
 if 'educ_a1' in mh_demo_complete.columns:
     print("\nGAD-2+ Prevalence by Adult Education:")
-    gad2_by_educ = mh_demo_complete.groupby('educ_a1').agg({
-        'gad2_positive': ['count', 'sum', 'mean']
-    }).round(3)
+    gad2_by_educ = (
+        mh_demo_complete.groupby('educ_a1', sort=False)['gad2_positive']
+        .agg(['count', 'sum', 'mean'])
+        .round(3)
+    )
     gad2_by_educ.columns = ['N', 'N_positive', 'Prevalence']
     gad2_by_educ['Prevalence'] = gad2_by_educ['Prevalence'] * 100
     print(gad2_by_educ)
@@ -154,13 +164,19 @@ print("\n" + "=" * 70)
 print("EXAMPLE 5: Correlation Analysis (Depression, Anxiety, Parenting)")
 print("=" * 70)
 
-# Calculate total scores
-mh_complete['phq2_total'] = mh_complete['phq2_interest'] + mh_complete['phq2_depressed']
-mh_complete['gad2_total'] = mh_complete['gad2_nervous'] + mh_complete['gad2_worry']
+# Extract the items once as a float32 array (0-3 scores are exact in float32)
+items = mh_complete[['phq2_interest', 'phq2_depressed', 'gad2_nervous', 'gad2_worry', 'q1502']]
+arr = items.to_numpy(dtype=np.float32)
 
-# Correlation matrix
-corr_vars = ['phq2_total', 'gad2_total', 'q1502']
-corr_matrix = mh_complete[corr_vars].corr().round(3)
+# Total scores computed on the array; .corr() keeps pairwise-complete
+# observations, so a row missing q1502 still counts for PHQ-2 vs GAD-2
+phq2_total = arr[:, 0] + arr[:, 1]
+gad2_total = arr[:, 2] + arr[:, 3]
+corr_matrix = pd.DataFrame({
+    'phq2_total': phq2_total,
+    'gad2_total': gad2_total,
+    'q1502': arr[:, 4]
+}).corr().round(3)
 
 print("\nCorrelation Matrix:")
 print(corr_matrix)
@@ -178,14 +194,15 @@ print("\n" + "=" * 70)
 print("EXAMPLE 6: Get Complete Dataset with Mental Health")
 print("=" * 70)
 
-# Get ALL imputed variables including mental health
-df_complete = get_complete_dataset(
+# Get ALL imputed variables including mental health, for records with mental health data
+df_analysis = get_complete_dataset(
     study_id='ne25',
     imputation_number=1,
-    include_mental_health=True
+    include_mental_health=True,
+    require_nonnull=['phq2_interest']
 )
 
-print(f"\n[OK] Loaded {len(df_complete)} records with {len(df_complete.columns)} columns")
+print(f"\n[OK] Loaded {len(df_analysis)} records with mental health data ({len(df_analysis.columns)} columns)")
 print(f"\nImputed variables included:")
 print(f"  - Geography (3): puma, county, census_tract")
 print(f"  - Sociodemographic (7): female, raceG, educ_mom, educ_a2, income, family_size, fplcat")
@@ -194,13 +211,13 @@ print(f"  - Mental Health (7): phq2_interest, phq2_depressed, phq2_positive, gad
 print(f"  - TOTAL: 21 imputed variables")
 
 # Example analysis: PHQ-2+ by childcare arrangement
-df_analysis = df_complete[df_complete['phq2_interest'].notna()].copy()
-
 if 'cc_receives_care' in df_analysis.columns:
     print("\nPHQ-2+ Prevalence by Childcare Receipt:")
-    phq2_by_cc = df_analysis.groupby('cc_receives_care').agg({
-        'phq2_positive': ['count', 'sum', 'mean']
-    }).round(3)
+    phq2_by_cc = (
+        df_analysis.groupby('cc_receives_care', sort=False)['phq2_positive']
+        .agg(['count', 'sum', 'mean'])
+        .round(3)
+    )
     phq2_by_cc.columns = ['N', 'N_positive', 'Prevalence']
     phq2_by_cc['Prevalence'] = phq2_by_cc['Prevalence'] * 100
     print(phq2_by_cc)
@@ -42,7 +42,11 @@ from typing import Dict, Any, Optional
 # Import our ACS pipeline modules
 from python.acs.config_manager import get_state_config, load_config, validate_config
 from python.acs.extract_manager import get_or_submit_extract
-from python.acs.cache_manager import generate_extract_signature
+from python.acs.cache_manager import (
+    generate_extract_signature,
+    schema_fingerprint,
+    write_extract_manifest
+)
 from python.acs.data_loader import load_and_convert, validate_ipums_data
 
 # Configure structured logging
@@ -180,7 +184,7 @@ def create_output_directory(state: str, year_range: str, custom_output_dir: Opti
         output_dir = Path(f"data/acs/{state}/{year_range}")
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    log.info("Output directory created", path=str(output_dir))
+    log.debug("Output directory ready", path=str(output_dir))
 
     return output_dir
 
@@ -190,17 +194,27 @@ def save_metadata(
     config: Dict[str, Any],
     extract_id: str,
     from_cache: bool,
-    file_paths: Dict[str, str]
+    file_paths: Dict[str, str],
+    row_count: Optional[int] = None,
+    columns: Optional[Dict[str, Any]] = None
 ) -> None:
     """Save extract metadata to JSON file.
 
+    Also writes the extract's cache manifest (data/acs/cache/extracts/
+    {extract_id}/manifest.json), used to invalidate the cached extract when
+    IPUMS re-releases the sample.
+
     Args:
         output_dir: Output directory
         config: Configuration dictionary
         extract_id: IPUMS extract ID
         from_cache: Whether data was retrieved from cache
         file_paths: Paths to extract files
+        row_count: Number of records loaded (optional)
+        columns: Mapping of column name to dtype (optional)
     """
+    extract_signature = generate_extract_signature(config)
+
     metadata = {
         "extract_id": extract_id,
         "state": config.get('state'),
@@ -209,7 +223,7 @@ def save_metadata(
         "acs_sample": config.get('acs_sample'),
         "from_cache": from_cache,
         "extraction_timestamp": datetime.utcnow().isoformat() + "Z",
-        "extract_signature": generate_extract_signature(config),
+        "extract_signature": extract_signature,
         "variables": config.get('variables', {}),
         "filters": config.get('filters', {}),
         "case_selections": config.get('case_selections', {}),
@@ -223,6 +237,42 @@ def save_metadata(
 
     log.info("Metadata saved", path=str(metadata_path))
 
+    write_extract_manifest(
+        extract_id,
+        extract_signature,
+        config.get('acs_sample'),
+        row_count=row_count,
+        schema_fingerprint=schema_fingerprint(columns) if columns else None
+    )
+
+
+def outputs_up_to_date(output_dir: Path, config: Dict[str, Any], extract_id: str) -> bool:
+    """Check whether raw.feather/metadata.json already reflect this extract.
+
+    Args:
+        output_dir: Output directory
+        config: Configuration dictionary
+        extract_id: IPUMS extract ID returned from cache
+
+    Returns:
+        bool: True if metadata.json records the same extract ID and signature
+            and raw.feather exists
+    """
+    metadata_path = output_dir / "metadata.json"
+    if not (output_dir / "raw.feather").exists():
+        return False
+
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
+
+    return (
+        metadata.get('extract_id') == extract_id
+        and metadata.get('extract_signature') == generate_extract_signature(config)
+    )
+
 
 def main():
     """Main extraction pipeline."""
@@ -245,9 +295,7 @@ def main():
 
     try:
         # 1. Load configuration
-        log.info("=" * 60)
-        log.info("STEP 1: Load Configuration")
-        log.info("=" * 60)
+        log.info("Pipeline step", step=1, name="Load Configuration")
 
         config = load_configuration(args.state, args.year_range, args.config)
 
@@ -257,16 +305,12 @@ def main():
             config['cache'] = {'enabled': False}
 
         # 2. Create output directory
-        log.info("=" * 60)
-        log.info("STEP 2: Create Output Directory")
-        log.info("=" * 60)
+        log.info("Pipeline step", step=2, name="Create Output Directory")
 
         output_dir = create_output_directory(args.state, args.year_range, args.output_dir)
 
         # 3. Get or submit extract (with caching)
-        log.info("=" * 60)
-        log.info("STEP 3: Get or Submit Extract")
-        log.info("=" * 60)
+        log.info("Pipeline step", step=3, name="Get or Submit Extract")
 
         if args.force_refresh:
             log.warning("Force refresh requested - bypassing cache")
@@ -279,13 +323,20 @@ def main():
 
         if from_cache:
             log.info("✓ Data retrieved from cache (~10 sec)", extract_id=extract_id)
+
+            # Outputs already built from this cached extract: nothing to redo
+            if outputs_up_to_date(output_dir, config, extract_id):
+                log.info(
+                    "✓ Cache hit - outputs up to date, skipping load and validation",
+                    extract_id=extract_id,
+                    output_dir=str(output_dir)
+                )
+                return 0
         else:
             log.info("✓ New extract completed and cached", extract_id=extract_id)
 
         # 4. Load data and convert to Feather format
-        log.info("=" * 60)
-        log.info("STEP 4: Load Data and Convert to Feather Format")
-        log.info("=" * 60)
+        log.info("Pipeline step", step=4, name="Load Data and Convert to Feather Format")
 
         raw_data_path = file_paths.get('raw_data')
         ddi_path = file_paths.get('ddi_codebook')
@@ -319,35 +370,28 @@ def main():
             # Continue anyway - validation issues are warnings, not errors
 
         # 5. Save metadata
-        log.info("=" * 60)
-        log.info("STEP 5: Save Metadata")
-        log.info("=" * 60)
-
-        save_metadata(output_dir, config, extract_id, from_cache, file_paths)
-
-        # 6. Summary
-        log.info("=" * 60)
-        log.info("EXTRACTION PIPELINE COMPLETE")
-        log.info("=" * 60)
-
-        summary = {
-            "Extract ID": extract_id,
-            "State": config.get('state'),
-            "Year Range": config.get('year_range'),
-            "From Cache": "Yes" if from_cache else "No",
-            "Records": len(df),
-            "Variables": len(df.columns),
-            "Output Directory": str(output_dir),
-            "Feather File": str(feather_path),
-            "Raw Data (cached)": file_paths.get('raw_data'),
-            "DDI Codebook": file_paths.get('ddi_codebook', 'N/A'),
-            "Data Valid": "Yes" if validation_results['valid'] else "Issues Found"
-        }
-
-        for key, value in summary.items():
-            log.info(f"{key}: {value}")
-
-        log.info("✓ Pipeline completed successfully")
+        log.info("Pipeline step", step=5, name="Save Metadata")
+
+        save_metadata(
+            output_dir, config, extract_id, from_cache, file_paths,
+            row_count=len(df), columns=df.dtypes.to_dict()
+        )
+
+        # 6. Summary (one structured event)
+        log.info(
+            "✓ Pipeline completed successfully",
+            extract_id=extract_id,
+            state=config.get('state'),
+            year_range=config.get('year_range'),
+            from_cache=from_cache,
+            records=len(df),
+            variables=len(df.columns),
+            output_dir=str(output_dir),
+            feather_file=str(feather_path),
+            raw_data=file_paths.get('raw_data'),
+            ddi_codebook=file_paths.get('ddi_codebook'),
+            data_valid=validation_results['valid']
+        )
         return 0
 
     except FileNotFoundError as e:
@@ -363,10 +407,9 @@ def main():
         log.error(
             "Pipeline failed with unexpected error",
             error=str(e),
-            error_type=type(e).__name__
+            error_type=type(e).__name__,
+            exc_info=True
         )
-        import traceback
-        traceback.print_exc()
         return 1
 
 
@@ -6,14 +6,20 @@ This script generates comprehensive variable metadata from the transformed data,
 replacing R's metadata generation functionality to avoid segmentation faults.
 """
 
+import os
 import sys
 import argparse
+import functools
+import logging
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import traceback
 import re
 import yaml
@@ -26,7 +32,11 @@ try:
     from utils.logging import setup_logging, with_logging, PerformanceLogger, error_context
 except ImportError:
     # Basic logging fallback
-    import logging
+    from contextlib import nullcontext
+
+    # One shared no-op context manager instead of a new class and instance per call
+    _NULL_CONTEXT = nullcontext()
+
     def setup_logging(level="INFO", **kwargs):
         logging.basicConfig(level=getattr(logging, level))
         return logging.getLogger()
@@ -37,16 +47,38 @@ except ImportError:
         return decorator
 
     def PerformanceLogger(logger, operation, **kwargs):
-        class DummyContext:
-            def __enter__(self): return self
-            def __exit__(self, *args): pass
-        return DummyContext()
+        return _NULL_CONTEXT
 
     def error_context(logger, operation, **kwargs):
-        class DummyContext:
-            def __enter__(self): return self
-            def __exit__(self, *args): pass
-        return DummyContext()
+        return _NULL_CONTEXT
+
+
+# libyaml's C parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_yaml_config(config_path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file (cached per path, modification time and size)."""
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+def load_yaml_config(config_path: str) -> Any:
+    """
+    Load a YAML configuration file, reusing the parsed result while it is unchanged.
+
+    Both the derived variable list and the variable labels come from the same
+    file, so one run parses it once. Callers must not mutate the result.
+
+    Args:
+        config_path: Path to the YAML file
+
+    Returns:
+        Parsed YAML content
+    """
+    stat = Path(config_path).stat()
+    return _parse_yaml_config(str(config_path), stat.st_mtime_ns, stat.st_size)
 
 
 def load_derived_variables_config(config_path: str) -> Optional[List[str]]:
@@ -64,11 +96,10 @@ def load_derived_variables_config(config_path: str) -> Optional[List[str]]:
         if not config_file.exists():
             return None
 
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_yaml_config(config_path)
 
         if 'all_derived_variables' in config:
-            return config['all_derived_variables']
+            return list(config['all_derived_variables'])
         else:
             return None
 
@@ -92,11 +123,10 @@ def load_variable_labels(config_path: str) -> Dict[str, str]:
         if not config_file.exists():
             return {}
 
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_yaml_config(config_path)
 
         if 'variable_labels' in config:
-            return config['variable_labels']
+            return dict(config['variable_labels'])
         else:
             return {}
 
@@ -187,19 +217,25 @@ def load_codebook_domains(codebook_path: str = "codebook/data/codebook.json") ->
         return {}
 
 
-def load_redcap_metadata(db_ops: DatabaseOperations) -> Dict[str, Dict[str, Any]]:
+def load_redcap_metadata(
+    db_ops: DatabaseOperations,
+    table_catalog: Optional[Dict[str, Optional[int]]] = None
+) -> Dict[str, Dict[str, Any]]:
     """
     Load REDCap data dictionary metadata from the database.
 
     Args:
         db_ops: Database operations instance
+        table_catalog: Known tables from get_table_catalog (queried if not given)
 
     Returns:
         Dictionary mapping field names to REDCap metadata dictionaries
     """
     try:
         # Check if the table exists
-        if not db_ops.table_exists("ne25_data_dictionary"):
+        if table_catalog is None:
+            table_catalog = get_table_catalog(db_ops)
+        if "ne25_data_dictionary" not in table_catalog:
             return {}
 
         # Query the dictionary table
@@ -243,115 +279,345 @@ def load_redcap_metadata(db_ops: DatabaseOperations) -> Dict[str, Dict[str, Any]
         return {}
 
 
-@with_logging("analyze_variable")
-def analyze_variable(series: pd.Series, var_name: str) -> Dict[str, Any]:
+# Encoder for the JSON string fields: orjson's C serializer when it is installed,
+# otherwise one shared stdlib encoder (json.dumps would build a new JSONEncoder on
+# every call). The stored format is pinned to compact, non-ASCII-escaped JSON with
+# string keys, which is what orjson writes, so the stored strings do not depend on
+# which encoder is available.
+JSON_SEPARATORS = (",", ":")
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=JSON_SEPARATORS)
+
+try:
+    import orjson
+
+    def encode_json(value: Any) -> str:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    encode_json = _JSON_ENCODER.encode
+
+# Character columns with at most this many distinct non-missing values become factors
+FACTOR_MAX_LEVELS = 20
+
+DUCKDB_INTEGER_TYPES = {
+    'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+    'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT', 'UHUGEINT'
+}
+DUCKDB_FLOAT_TYPES = {'FLOAT', 'DOUBLE'}
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a column name for use in DuckDB SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def map_duckdb_type(column_type: str) -> Tuple[str, str]:
     """
-    Analyze a pandas Series to generate metadata.
+    Map a DuckDB column type to the (data_type, storage_mode) pair used in metadata.
 
     Args:
-        series: Pandas Series to analyze
-        var_name: Variable name
+        column_type: DuckDB type name as reported by PRAGMA table_info
+
+    Returns:
+        Tuple of (data_type, storage_mode)
+    """
+    if column_type == 'BOOLEAN':
+        return "logical", "logical"
+    if column_type in DUCKDB_INTEGER_TYPES:
+        return "numeric", "integer"
+    if column_type in DUCKDB_FLOAT_TYPES or column_type.startswith('DECIMAL'):
+        return "numeric", "double"
+    return "character", "character"
+
+
+def get_table_catalog(db_ops: DatabaseOperations) -> Dict[str, Optional[int]]:
+    """
+    List the tables and views in the database with one catalog query.
+
+    Args:
+        db_ops: Database operations instance
+
+    Returns:
+        Dictionary mapping table names to their estimated row counts (None for
+        views); estimates still include deleted rows until a checkpoint
+    """
+    query = """
+    SELECT table_name, estimated_size FROM duckdb_tables()
+    UNION ALL
+    SELECT view_name, NULL FROM duckdb_views() WHERE NOT internal
+    """
+    with db_ops.db_manager.get_connection(read_only=True) as conn:
+        return dict(conn.execute(query).fetchall())
+
+
+def get_table_columns(table_name: str, db_ops: DatabaseOperations) -> Dict[str, str]:
+    """
+    Get the column names and DuckDB types of a table.
+
+    Args:
+        table_name: Table to describe
+        db_ops: Database operations instance
+
+    Returns:
+        Dictionary mapping column names (in table order) to DuckDB type names
+    """
+    columns_df = db_ops.query_to_dataframe(f"PRAGMA table_info('{table_name}')")
+    if columns_df is None:
+        raise RuntimeError(f"Failed to read columns of {table_name}")
+
+    return dict(zip(columns_df["name"].tolist(), columns_df["type"].tolist()))
+
+
+def summarize_table(
+    table_name: str,
+    columns: Dict[str, str],
+    db_ops: DatabaseOperations
+) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+    """
+    Compute summary statistics for selected columns of a table inside DuckDB.
+
+    One generated aggregate query computes every column's missing count, exact
+    distinct count and, for numeric columns, min/max/mean in a single pass over
+    the table. Only the listed columns are referenced, so DuckDB never reads the
+    others, and only one row is returned to Python.
+
+    Args:
+        table_name: Table to summarize
+        columns: Dictionary mapping the column names to summarize to their DuckDB
+            types, as returned by get_table_columns()
+        db_ops: Database operations instance
+
+    Returns:
+        Tuple of (row count, dictionary mapping column names to summary
+        dictionaries with column_name, column_type, count, n_missing,
+        unique_values and, for numeric columns, min, max and avg)
+    """
+    columns = list(columns.items())
+
+    aggregates = ["COUNT(*) AS n_rows"]
+    for i, (column_name, column_type) in enumerate(columns):
+        column = quote_identifier(column_name)
+        aggregates.append(f"COUNT({column}) AS n_present_{i}")
+        aggregates.append(f"COUNT(DISTINCT {column}) AS n_unique_{i}")
+        if map_duckdb_type(column_type)[0] == "numeric":
+            aggregates.append(f"MIN({column}) AS min_{i}")
+            aggregates.append(f"MAX({column}) AS max_{i}")
+            aggregates.append(f"AVG({column}) AS avg_{i}")
+
+    stats_table = db_ops.query_to_arrow(f"SELECT {', '.join(aggregates)} FROM {table_name}")
+    if stats_table is None:
+        raise RuntimeError(f"Failed to compute column statistics for {table_name}")
+    stats = stats_table.to_pylist()[0]
+
+    n_rows = int(stats["n_rows"])
+    summaries = {}
+    for i, (column_name, column_type) in enumerate(columns):
+        summary = {
+            "column_name": column_name,
+            "column_type": column_type,
+            "count": n_rows,
+            "n_missing": n_rows - int(stats[f"n_present_{i}"]),
+            "unique_values": int(stats[f"n_unique_{i}"])
+        }
+        if f"min_{i}" in stats:
+            summary["min"] = stats[f"min_{i}"]
+            summary["max"] = stats[f"max_{i}"]
+            summary["avg"] = stats[f"avg_{i}"]
+        summaries[column_name] = summary
+
+    return n_rows, summaries
+
+
+def is_factor_candidate(summary: Dict[str, Any]) -> bool:
+    """
+    Check whether a column summary describes a factor variable.
+
+    Args:
+        summary: Column summary as returned by summarize_table()
+
+    Returns:
+        True if the column's value counts should be queried
+    """
+    data_type, _ = map_duckdb_type(summary["column_type"])
+    return (
+        data_type == "character"
+        and summary["unique_values"] <= FACTOR_MAX_LEVELS
+        and summary["unique_values"] < summary["count"] * 0.5
+    )
+
+
+def query_value_counts(
+    table_name: str,
+    column_names: List[str],
+    db_ops: DatabaseOperations
+) -> Dict[str, Dict[Any, int]]:
+    """
+    Count the values of low-cardinality columns inside DuckDB.
+
+    All columns are counted in a single UNION ALL query, so the table is
+    aggregated in one round-trip however many factor candidates there are.
+    Values are returned as strings.
+
+    Args:
+        table_name: Table containing the columns
+        column_names: Columns to count
+        db_ops: Database operations instance
+
+    Returns:
+        Dictionary mapping each column name to its value counts (value -> count,
+        None for missing, ordered by descending count)
+    """
+    if not column_names:
+        return {}
+
+    # Every allowed level plus NULL
+    limit = FACTOR_MAX_LEVELS + 1
+    branches = []
+    for k, column_name in enumerate(column_names):
+        column = quote_identifier(column_name)
+        # Group on the column itself so ENUM, DATE and other non-VARCHAR columns
+        # hash their native values; only the few resulting groups are cast
+        branches.append(
+            f"SELECT * FROM (SELECT {k} AS k, CAST({column} AS VARCHAR) AS value, COUNT(*) AS n "
+            f"FROM {table_name} GROUP BY {column} ORDER BY n DESC, value NULLS LAST LIMIT {limit})"
+        )
+    query = "\nUNION ALL\n".join(branches) + "\nORDER BY k, n DESC, value NULLS LAST"
+
+    counts_table = db_ops.query_to_arrow(query)
+    if counts_table is None:
+        raise RuntimeError(f"Failed to count factor candidate values in {table_name}")
+
+    # Arrow returns SQL NULL as None, the key used for missing values
+    value_counts = {column_name: {} for column_name in column_names}
+    for k, value, n in zip(*(counts_table.column(name).to_pylist() for name in ("k", "value", "n"))):
+        value_counts[column_names[k]][value] = n
+
+    return value_counts
+
+
+def analyze_column_summary(
+    summary: Dict[str, Any],
+    value_counts: Optional[Dict[Any, int]] = None
+) -> Dict[str, Any]:
+    """
+    Generate variable metadata from a column summary.
+
+    Args:
+        summary: Column summary as returned by summarize_table()
+        value_counts: Value counts for factor variables, as returned by
+            query_value_counts(); None for other columns
 
     Returns:
         Dictionary with variable metadata
     """
-    if series.empty:
-        raise ValueError(f"Cannot analyze empty series for variable {var_name}")
+    var_name = summary["column_name"]
+    n_total = int(summary["count"])
+    if n_total == 0:
+        raise ValueError(f"Cannot analyze empty column for variable {var_name}")
+
+    n_missing = summary["n_missing"]
+    data_type, storage_mode = map_duckdb_type(summary["column_type"])
     metadata = {
         "variable_name": var_name,
-        "n_total": len(series),
-        "n_missing": series.isna().sum(),
-        "missing_percentage": round((series.isna().sum() / len(series)) * 100, 2),
-        "unique_values": series.nunique()
+        "n_total": n_total,
+        "n_missing": n_missing,
+        "missing_percentage": round((n_missing / n_total) * 100, 2),
+        "unique_values": summary["unique_values"],
+        "data_type": data_type,
+        "storage_mode": storage_mode
     }
 
-    # Determine data type
-    if pd.api.types.is_bool_dtype(series):
-        metadata["data_type"] = "logical"
-        metadata["storage_mode"] = "logical"
-    elif pd.api.types.is_numeric_dtype(series):
-        metadata["data_type"] = "numeric"
-        metadata["storage_mode"] = "double" if series.dtype == 'float64' else "integer"
-
+    if data_type == "numeric":
         # Numeric summary statistics
-        if not series.isna().all():
-            metadata["min_value"] = float(series.min()) if not pd.isna(series.min()) else None
-            metadata["max_value"] = float(series.max()) if not pd.isna(series.max()) else None
-            metadata["mean_value"] = float(series.mean()) if not pd.isna(series.mean()) else None
-    else:
-        metadata["data_type"] = "character"
-        metadata["storage_mode"] = "character"
-
-        # For categorical data, try to identify if it should be a factor
-        if metadata["unique_values"] <= 20 and metadata["unique_values"] < metadata["n_total"] * 0.5:
-            metadata["data_type"] = "factor"
-
-            # Generate enhanced factor metadata
-            factor_metadata = analyze_factor_variable(series, var_name)
-            metadata.update(factor_metadata)
+        if n_missing < n_total:
+            metadata["min_value"] = float(summary["min"])
+            metadata["max_value"] = float(summary["max"])
+            metadata["mean_value"] = float(summary["avg"])
+    elif value_counts is not None:
+        # Low-cardinality character data is treated as a factor
+        metadata["data_type"] = "factor"
+
+        # Generate enhanced factor metadata
+        factor_metadata = build_factor_metadata(value_counts, n_total, var_name)
+        metadata.update(factor_metadata)
 
     return metadata
 
 
-def analyze_factor_variable(series: pd.Series, var_name: str) -> Dict[str, Any]:
+def build_factor_metadata(
+    value_counts: Dict[Any, int],
+    n_total: int,
+    var_name: str
+) -> Dict[str, Any]:
     """
-    Analyze a factor variable to extract levels, labels, and ordering.
+    Build factor levels, labels, and ordering from value counts.
 
     Args:
-        series: Pandas Series containing factor data
+        value_counts: Dictionary mapping each value (including missing) to its count
+        n_total: Total number of observations
         var_name: Variable name for context
 
     Returns:
         Dictionary with factor-specific metadata
     """
-    # Get value counts (excluding missing values for ordering)
-    value_counts = series.value_counts(dropna=False)
-
-    # Create factor levels with proper ordering
-    factor_levels = []
-    value_labels = {}
-    value_counts_dict = {}
-
     # Sort levels logically based on variable type
-    sorted_values = sort_factor_levels(list(value_counts.index), var_name)
+    sorted_values = sort_factor_levels(list(value_counts), var_name)
 
-    # Build factor metadata
-    for i, level in enumerate(sorted_values):
-        if pd.isna(level):
-            level_key = "NA"
-            level_label = "Missing/Not Available"
-        else:
-            level_key = str(i + 1)  # 1-based indexing for R compatibility
-            level_label = str(level)
+    # Parallel per-level lists: codes are 1-based for R compatibility, missing is "NA"
+    codes = ["NA" if pd.isna(level) else str(i + 1) for i, level in enumerate(sorted_values)]
+    labels = [
+        "Missing/Not Available" if code == "NA" else str(level)
+        for code, level in zip(codes, sorted_values)
+    ]
+    counts = [int(value_counts[level]) for level in sorted_values]
 
-        factor_levels.append({
-            "code": level_key,
-            "label": level_label,
+    # Build factor metadata
+    factor_levels = [
+        {
+            "code": code,
+            "label": label,
             "original_value": level,
-            "count": int(value_counts.get(level, 0)),
-            "percentage": round((value_counts.get(level, 0) / len(series)) * 100, 2)
-        })
-
-        value_labels[level_key] = level_label
-        value_counts_dict[level_key] = int(value_counts.get(level, 0))
+            "count": count,
+            "percentage": round((count / n_total) * 100, 2)
+        }
+        for code, label, level, count in zip(codes, labels, sorted_values, counts)
+    ]
+    value_labels = dict(zip(codes, labels))
+    value_counts_dict = dict(zip(codes, counts))
 
-    # Identify reference level (typically the most common non-missing value)
-    non_missing_levels = [level for level in factor_levels if level["original_value"] is not pd.NA and not pd.isna(level["original_value"])]
-    reference_level = None
-    if non_missing_levels:
-        # Use the most frequent level as reference, or first level if tie
-        reference_level = max(non_missing_levels, key=lambda x: x["count"])["code"]
+    # Reference level: the most frequent non-missing level (first one on ties)
+    present = [i for i, code in enumerate(codes) if code != "NA"]
+    reference_level = codes[max(present, key=counts.__getitem__)] if present else None
 
     return {
         "factor_levels": factor_levels,
-        "value_labels": json.dumps(value_labels, ensure_ascii=False),
-        "value_counts": json.dumps(value_counts_dict),
+        "value_labels": encode_json(value_labels),
+        "value_counts": encode_json(value_counts_dict),
         "reference_level": reference_level,
         "ordered_factor": is_ordered_factor(var_name),
         "factor_type": determine_factor_type(var_name)
     }
 
 
+# Known level orders for sort_factor_levels (lowercased level -> rank)
+EDUCATION_LEVEL_ORDER = {
+    'less than high school graduate': 1,
+    'high school graduate (including equivalency)': 2,
+    'some college or associate\'s degree': 3,
+    'college degree': 4,
+    'graduate or professional degree': 5
+}
+FPL_LEVEL_ORDER = {
+    'below federal poverty level': 1,
+    'at or above federal poverty level': 2,
+    '<100% fpl': 1,
+    '100-199% fpl': 2,
+    '200-299% fpl': 3,
+    '300-399% fpl': 4,
+    '400%+ fpl': 5
+}
+_DIGIT_RE = re.compile(r'\d+')
+
+
 def sort_factor_levels(levels: List[Any], var_name: str) -> List[Any]:
     """
     Sort factor levels in a logical order based on variable type.
@@ -365,67 +631,51 @@ def sort_factor_levels(levels: List[Any], var_name: str) -> List[Any]:
     """
     var_lower = var_name.lower()
 
+    # Missing values always sort last, so split them off in one pass and keep
+    # the per-level sort keys below free of missing-value checks
+    present = []
+    missing = []
+    for level in levels:
+        (missing if pd.isna(level) else present).append(level)
+
     # Custom sorting for specific variable types
     if 'educ' in var_lower:
         # Education levels: Less than HS < HS Graduate < Some College < College Degree < Graduate/Professional
-        education_order = {
-            'less than high school graduate': 1,
-            'high school graduate (including equivalency)': 2,
-            'some college or associate\'s degree': 3,
-            'college degree': 4,
-            'graduate or professional degree': 5
-        }
-
-        def edu_sort_key(level):
-            if pd.isna(level):
-                return 999  # Missing values last
-            level_str = str(level).lower()
-            return education_order.get(level_str, 100)  # Unknown levels after known ones
-
-        return sorted(levels, key=edu_sort_key)
+        def sort_key(level):
+            return EDUCATION_LEVEL_ORDER.get(str(level).lower(), 100)  # Unknown levels after known ones
 
     elif 'fpl' in var_lower or 'poverty' in var_lower:
         # Income/poverty levels: typically ordered from low to high
-        fpl_order = {
-            'below federal poverty level': 1,
-            'at or above federal poverty level': 2,
-            '<100% fpl': 1,
-            '100-199% fpl': 2,
-            '200-299% fpl': 3,
-            '300-399% fpl': 4,
-            '400%+ fpl': 5
-        }
-
-        def fpl_sort_key(level):
-            if pd.isna(level):
-                return 999
-            level_str = str(level).lower()
-            return fpl_order.get(level_str, 100)
-
-        return sorted(levels, key=fpl_sort_key)
+        def sort_key(level):
+            return FPL_LEVEL_ORDER.get(str(level).lower(), 100)
 
     elif 'age' in var_lower and 'cat' in var_lower:
         # Age categories: sort numerically by age ranges
-        def age_sort_key(level):
-            if pd.isna(level):
-                return 999
-            level_str = str(level)
+        def sort_key(level):
             # Extract first number from age ranges like "0-11 months", "1-2 years"
-            numbers = re.findall(r'\d+', level_str)
-            return int(numbers[0]) if numbers else 100
-
-        return sorted(levels, key=age_sort_key)
+            number = _DIGIT_RE.search(str(level))
+            return int(number.group()) if number else 100
 
     else:
-        # Default sorting: missing values last, then alphabetical
-        def default_sort_key(level):
-            if pd.isna(level):
-                return ('zzz_missing', '')
-            return ('a_value', str(level))
+        # Default sorting: alphabetical
+        sort_key = str
+
+    return sorted(present, key=sort_key) + missing
 
-        return sorted(levels, key=default_sort_key)
 
+# Name substrings of variables that are typically ordered
+ORDERED_FACTOR_PATTERNS = (
+    'educ',  # Education levels
+    'fpl',   # Income/poverty levels
+    'age',   # Age categories
+    'grade', # Grade levels
+    'level', # General level variables
+    'scale', # Scale variables
+    'severity' # Severity scales
+)
 
+
+@functools.lru_cache(maxsize=4096)
 def is_ordered_factor(var_name: str) -> bool:
     """
     Determine if a factor variable should be treated as ordered.
@@ -437,21 +687,22 @@ def is_ordered_factor(var_name: str) -> bool:
         True if factor should be ordered, False otherwise
     """
     var_lower = var_name.lower()
+    return any(pattern in var_lower for pattern in ORDERED_FACTOR_PATTERNS)
 
-    # Variables that are typically ordered
-    ordered_patterns = [
-        'educ',  # Education levels
-        'fpl',   # Income/poverty levels
-        'age',   # Age categories
-        'grade', # Grade levels
-        'level', # General level variables
-        'scale', # Scale variables
-        'severity' # Severity scales
-    ]
 
-    return any(pattern in var_lower for pattern in ordered_patterns)
+# Name substrings for determine_factor_type, in priority order
+FACTOR_TYPE_KEYWORDS = (
+    ('demographic_race', ('race', 'ethnic')),
+    ('demographic_sex', ('sex', 'gender')),
+    ('socioeconomic_education', ('educ',)),
+    ('socioeconomic_income', ('fpl', 'poverty', 'income')),
+    ('demographic_age', ('age',)),
+    ('relationship', ('relation', 'caregiver')),
+    ('geographic', ('county', 'state', 'zip', 'geographic')),
+)
 
 
+@functools.lru_cache(maxsize=4096)
 def determine_factor_type(var_name: str) -> str:
     """
     Determine the type/category of a factor variable.
@@ -464,24 +715,51 @@ def determine_factor_type(var_name: str) -> str:
     """
     var_lower = var_name.lower()
 
-    if any(term in var_lower for term in ['race', 'ethnic']):
-        return 'demographic_race'
-    elif any(term in var_lower for term in ['sex', 'gender']):
-        return 'demographic_sex'
-    elif 'educ' in var_lower:
-        return 'socioeconomic_education'
-    elif any(term in var_lower for term in ['fpl', 'poverty', 'income']):
-        return 'socioeconomic_income'
-    elif 'age' in var_lower:
-        return 'demographic_age'
-    elif any(term in var_lower for term in ['relation', 'caregiver']):
-        return 'relationship'
-    elif any(term in var_lower for term in ['county', 'state', 'zip', 'geographic']):
-        return 'geographic'
-    else:
-        return 'other'
+    for factor_type, terms in FACTOR_TYPE_KEYWORDS:
+        if any(term in var_lower for term in terms):
+            return factor_type
+    return 'other'
 
 
+# Name substrings for categorize_variable, in priority order: a variable whose
+# name contains keywords from several categories gets the first category listed.
+# Mental health and ACE terms come before sex so that e.g. ace_sexual_abuse is
+# not classified as a sex variable.
+CATEGORY_KEYWORDS = [
+    ('eligibility', ['cid']),
+    ('mental_health', ['phq2_', 'gad2_']),
+    ('adverse_experiences', ['ace_']),
+    ('childcare', ['cc_', 'childcare', 'child_care']),
+    ('age', ['age', 'years_old', 'months_old', 'days_old']),
+    ('sex', ['sex', 'gender', 'female', 'male']),
+    ('race', ['race', 'hisp', 'ethnic', 'raceg', 'a1_race']),
+    ('education', ['educ', 'education', 'mom', 'maternal']),
+    ('income', ['income', 'fpl', 'poverty', 'family_size']),
+    ('caregiver relationship', ['relation', 'caregiver', 'a1_', 'a2_']),
+    ('geography', [
+        'zip', 'county', 'state', 'geographic',
+        'puma', 'tract', 'cbsa', 'urban_rural',
+        'school', 'sldl', 'sldu', 'congress',
+        'aiannh'
+    ]),
+]
+_KEYWORD_PRIORITY = {
+    keyword: priority
+    for priority, (_, keywords) in enumerate(CATEGORY_KEYWORDS)
+    for keyword in keywords
+}
+_ADVERSE_EXPERIENCES_PRIORITY = [category for category, _ in CATEGORY_KEYWORDS].index('adverse_experiences')
+
+# One compiled alternation replaces a Python loop over every keyword. The
+# zero-width lookahead reports a match at every position, so overlapping
+# keywords ('male' inside 'female') are all seen, and at each position the
+# alternation tries keywords in priority order.
+_CATEGORY_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(keyword) for keyword in _KEYWORD_PRIORITY) + '))'
+)
+
+
+@functools.lru_cache(maxsize=4096)
 def categorize_variable(var_name: str) -> str:
     """
     Categorize a variable based on its name.
@@ -492,105 +770,190 @@ def categorize_variable(var_name: str) -> str:
     Returns:
         Category string
     """
-    var_lower = var_name.lower()
-
     # Core identifiers
     if var_name in ['record_id', 'pid', 'retrieved_date']:
         return 'core'
 
     # Eligibility flags
-    if var_name in ['eligible', 'authentic', 'include'] or 'cid' in var_lower:
+    if var_name in ['eligible', 'authentic', 'include']:
         return 'eligibility'
 
-    # Mental health screening variables (PHQ-2, GAD-2) - Check before sex to avoid misclassification
-    if any(mh_term in var_lower for mh_term in ['phq2_', 'gad2_']):
-        return 'mental_health'
-
-    # Adverse Childhood Experiences (ACE) variables - Check before sex to avoid ace_sexual_abuse misclassification
-    if 'ace_' in var_lower or var_name.startswith('cace'):
-        return 'adverse_experiences'
+    # Highest-priority category among all keywords found in the name
+    priority = min(
+        (_KEYWORD_PRIORITY[match.group(1)] for match in _CATEGORY_KEYWORD_RE.finditer(var_name.lower())),
+        default=len(CATEGORY_KEYWORDS)
+    )
 
-    # Childcare variables
-    if 'cc_' in var_lower or any(cc_term in var_lower for cc_term in ['childcare', 'child_care']):
-        return 'childcare'
+    # Adverse Childhood Experiences (ACE) composite variables
+    if var_name.startswith('cace'):
+        priority = min(priority, _ADVERSE_EXPERIENCES_PRIORITY)
 
-    # Age variables
-    if any(age_term in var_lower for age_term in ['age', 'years_old', 'months_old', 'days_old']):
-        return 'age'
+    if priority < len(CATEGORY_KEYWORDS):
+        return CATEGORY_KEYWORDS[priority][0]
 
-    # Sex/gender variables
-    if any(sex_term in var_lower for sex_term in ['sex', 'gender', 'female', 'male']):
-        return 'sex'
+    return 'other'
 
-    # Race/ethnicity variables
-    if any(race_term in var_lower for race_term in ['race', 'hisp', 'ethnic', 'raceg', 'a1_race']):
-        return 'race'
 
-    # Education variables
-    if any(educ_term in var_lower for educ_term in ['educ', 'education', 'mom', 'maternal']):
-        return 'education'
+# Base transformation note for each categorize_variable category
+TRANSFORMATION_NOTES = {
+    'core': 'Core identifier or system variable',
+    'eligibility': 'Eligibility determination based on CID criteria',
+    'age': 'Age calculated from date of birth in various units',
+    'sex': 'Sex/gender variable from demographic data',
+    'race': 'Race/ethnicity variables harmonized from checkbox responses',
+    'education': 'Education levels recoded into standardized categories',
+    'income': 'Income and federal poverty level calculations',
+    'caregiver relationship': 'Caregiver relationship and demographic variables',
+    'geography': 'Geographic location and residence variables',
+    'other': 'Other transformed variable'
+}
+DEFAULT_TRANSFORMATION_NOTE = 'Transformed variable'
+
+# Name patterns that add detail to transformation notes, in priority order
+NOTE_SUFFIXES = [
+    ('educ4', ' (4-category system)'),
+    ('educ6', ' (6-category system)'),
+    ('educ8', ' (8-category system)'),
+    ('fpl', ' - Federal Poverty Level calculations'),
+    ('a1_', ' - Primary caregiver'),
+    ('a2_', ' - Secondary caregiver'),
+]
+_NOTE_SUFFIX_PRIORITY = {token: priority for priority, (token, _) in enumerate(NOTE_SUFFIXES)}
+_NOTE_SUFFIX_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(token) for token, _ in NOTE_SUFFIXES) + '))'
+)
+
+# Every (category, suffix priority) combination resolved to its full note once,
+# so generating a note is a single dict lookup
+_NOTE_TABLE = {
+    (category, priority): base_note + (NOTE_SUFFIXES[priority][1] if priority is not None else '')
+    for category, base_note in TRANSFORMATION_NOTES.items()
+    for priority in [None, *range(len(NOTE_SUFFIXES))]
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def generate_transformation_notes(var_name: str, category: str) -> str:
+    """
+    Generate transformation notes for a variable.
 
-    # Income/poverty variables
-    if any(income_term in var_lower for income_term in ['income', 'fpl', 'poverty', 'family_size']):
-        return 'income'
+    Args:
+        var_name: Variable name
+        category: Variable category
 
-    # Caregiver relationship variables
-    if any(rel_term in var_lower for rel_term in ['relation', 'caregiver', 'a1_', 'a2_']):
-        return 'caregiver relationship'
+    Returns:
+        Transformation notes string
+    """
+    # Add specific notes for certain patterns
+    suffix_priority = min(
+        (_NOTE_SUFFIX_PRIORITY[match.group(1)] for match in _NOTE_SUFFIX_RE.finditer(var_name)),
+        default=None
+    )
 
-    # Geographic variables
-    if any(geo_term in var_lower for geo_term in [
-        'zip', 'county', 'state', 'geographic',
-        'puma', 'tract', 'cbsa', 'urban_rural',
-        'school', 'sldl', 'sldu', 'congress',
-        'aiannh'
-    ]):
-        return 'geography'
+    note = _NOTE_TABLE.get((category, suffix_priority))
+    if note is None:
+        # Categories without a note of their own (e.g. codebook domains)
+        note = DEFAULT_TRANSFORMATION_NOTE
+        if suffix_priority is not None:
+            note += NOTE_SUFFIXES[suffix_priority][1]
 
-    return 'other'
+    return note
 
 
-def generate_transformation_notes(var_name: str, category: str) -> str:
+@functools.lru_cache(maxsize=4096)
+def generate_variable_label(var_name: str) -> str:
     """
-    Generate transformation notes for a variable.
+    Generate a readable label from a variable name (e.g. "educ_max" -> "Educ Max").
 
     Args:
         var_name: Variable name
-        category: Variable category
 
     Returns:
-        Transformation notes string
+        Title-cased label
     """
-    notes_map = {
-        'core': 'Core identifier or system variable',
-        'eligibility': 'Eligibility determination based on CID criteria',
-        'age': 'Age calculated from date of birth in various units',
-        'sex': 'Sex/gender variable from demographic data',
-        'race': 'Race/ethnicity variables harmonized from checkbox responses',
-        'education': 'Education levels recoded into standardized categories',
-        'income': 'Income and federal poverty level calculations',
-        'caregiver relationship': 'Caregiver relationship and demographic variables',
-        'geography': 'Geographic location and residence variables',
-        'other': 'Other transformed variable'
-    }
+    return var_name.replace('_', ' ').title()
 
-    base_note = notes_map.get(category, 'Transformed variable')
 
-    # Add specific notes for certain patterns
-    if 'educ4' in var_name:
-        return f"{base_note} (4-category system)"
-    elif 'educ6' in var_name:
-        return f"{base_note} (6-category system)"
-    elif 'educ8' in var_name:
-        return f"{base_note} (8-category system)"
-    elif 'fpl' in var_name:
-        return f"{base_note} - Federal Poverty Level calculations"
-    elif 'a1_' in var_name:
-        return f"{base_note} - Primary caregiver"
-    elif 'a2_' in var_name:
-        return f"{base_note} - Secondary caregiver"
-
-    return base_note
+def build_variable_metadata(
+    summary: Dict[str, Any],
+    value_counts: Optional[Dict[Any, int]],
+    codebook_domains: Dict[str, str],
+    redcap_metadata: Dict[str, Dict[str, Any]],
+    variable_labels: Dict[str, str],
+    creation_date: str
+) -> Dict[str, Any]:
+    """
+    Build the complete metadata record for one variable.
+
+    Args:
+        summary: The variable's column summary from summarize_table()
+        value_counts: Value counts for factor candidates (see query_value_counts())
+        codebook_domains: Codebook domain classifications by variable name
+        redcap_metadata: REDCap data dictionary entries by field name
+        variable_labels: Descriptive labels from the derived variables config
+        creation_date: ISO timestamp shared by all variables of the run
+
+    Returns:
+        Dictionary with variable metadata
+    """
+    col_name = summary["column_name"]
+
+    # Generate basic metadata
+    var_metadata = analyze_column_summary(summary, value_counts)
+
+    # Add category with priority: codebook domain > simple categorization
+    category = codebook_domains.get(col_name)
+    if category is not None:
+        # Use codebook domain for child development items
+        var_metadata["category"] = category
+        var_metadata["domain_source"] = "codebook"
+    else:
+        # Use simple categorization for other variables
+        category = categorize_variable(col_name)
+        var_metadata["category"] = category
+        var_metadata["domain_source"] = "auto"
+
+    # Set variable label with priority: REDCap > YAML config > auto-generated
+    redcap_field = redcap_metadata.get(col_name)
+    if redcap_field is not None and redcap_field['field_label']:
+        # Use REDCap field label (original survey question)
+        var_metadata["variable_label"] = redcap_field['field_label']
+
+        # Add REDCap field note if available
+        if redcap_field['field_note']:
+            var_metadata["field_note"] = redcap_field['field_note']
+
+        # Add REDCap field type
+        if redcap_field['field_type']:
+            var_metadata["redcap_field_type"] = redcap_field['field_type']
+
+        # Add form name for context
+        if redcap_field['form_name']:
+            var_metadata["redcap_form"] = redcap_field['form_name']
+
+        # Add REDCap response options if available
+        if redcap_field['response_options']:
+            # Store as JSON string for database compatibility
+            var_metadata["redcap_response_options"] = encode_json(redcap_field['response_options'])
+
+    else:
+        # Use custom label from YAML config (derived variables), otherwise
+        # auto-generate one from the variable name
+        variable_label = variable_labels.get(col_name)
+        if variable_label is None:
+            variable_label = generate_variable_label(col_name)
+        var_metadata["variable_label"] = variable_label
+
+    var_metadata["transformation_notes"] = generate_transformation_notes(col_name, category)
+    var_metadata["creation_date"] = creation_date
+
+    # Add empty fields for compatibility (only if not already set by factor analysis)
+    if "summary_statistics" not in var_metadata:
+        var_metadata["summary_statistics"] = "{}"
+    if "value_labels" not in var_metadata:
+        var_metadata["value_labels"] = "{}"
+
+    return var_metadata
 
 
 @with_logging("generate_metadata_from_table")
@@ -599,7 +962,8 @@ def generate_metadata_from_table(
     db_ops: DatabaseOperations,
     exclude_columns: List[str] = None,
     derived_variables_list: Optional[List[str]] = None,
-    variable_labels: Optional[Dict[str, str]] = None
+    variable_labels: Optional[Dict[str, str]] = None,
+    table_catalog: Optional[Dict[str, Optional[int]]] = None
 ) -> List[Dict[str, Any]]:
     """
     Generate metadata for all columns in a table.
@@ -610,6 +974,7 @@ def generate_metadata_from_table(
         exclude_columns: Columns to exclude from metadata generation
         derived_variables_list: List of derived variables to filter to
         variable_labels: Dictionary of variable names to descriptive labels
+        table_catalog: Known tables from get_table_catalog (queried if not given)
 
     Returns:
         List of metadata dictionaries
@@ -626,174 +991,183 @@ def generate_metadata_from_table(
     if not table_name or not table_name.strip():
         raise ValueError("Table name cannot be empty")
 
-    if not db_ops.table_exists(table_name):
+    if table_catalog is None:
+        table_catalog = get_table_catalog(db_ops)
+
+    if table_name not in table_catalog:
         raise ValueError(f"Table {table_name} does not exist")
 
-    try:
-        with error_context(logger, "data_extraction", table_name=table_name):
-            # Get data from table with row limit for metadata analysis
-            logger.info(f"Querying data from {table_name} for metadata analysis...")
+    # The REDCap dictionary and the codebook do not depend on the table
+    # summary, so they load on worker threads while DuckDB scans the table
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        logger.info("Loading REDCap data dictionary metadata...")
+        redcap_future = pool.submit(load_redcap_metadata, db_ops, table_catalog)
+        logger.info("Loading codebook domain classifications...")
+        codebook_future = pool.submit(load_codebook_domains)
+
+        try:
+            with error_context(logger, "data_extraction", table_name=table_name):
+                table_columns = get_table_columns(table_name, db_ops)
+
+                # Filter columns for analysis before touching any data, so excluded
+                # columns are never scanned
+                columns_to_analyze = [col for col in table_columns if col not in exclude_columns]
+
+                # If derived_variables_list is provided, only analyze those variables
+                if derived_variables_list is not None:
+                    # Filter to only include derived variables that exist in the table
+                    available_derived = [col for col in derived_variables_list if col in table_columns]
+                    columns_to_analyze = available_derived
+                    logger.info(f"Filtering to derived variables only: {len(available_derived)} of {len(derived_variables_list)} derived variables found in table")
+
+                # Summarize the selected columns inside DuckDB instead of pulling rows into pandas
+                logger.info(f"Summarizing {table_name} for metadata analysis...")
+
+                total_rows, summaries = summarize_table(
+                    table_name,
+                    {col: table_columns[col] for col in columns_to_analyze},
+                    db_ops
+                )
+
+                if total_rows == 0:
+                    logger.error(f"No data found in table {table_name}")
+                    return []
 
-            # Check table size first
-            total_rows = db_ops.get_table_count(table_name)
-            sample_size = min(5000, total_rows)
+                logger.info(
+                    f"Analyzing {len(summaries)} of {len(table_columns)} columns from {total_rows} rows",
+                    extra={
+                        "table_name": table_name,
+                        "columns_count": len(table_columns),
+                        "analyzed_columns": len(summaries),
+                        "total_rows": total_rows
+                    }
+                )
 
-            query = f"SELECT * FROM {table_name} LIMIT {sample_size}"
-            df = db_ops.query_to_dataframe(query)
+            # Load REDCap metadata for enriching variable descriptions
+            redcap_metadata = redcap_future.result()
+            if redcap_metadata:
+                logger.info(f"Loaded REDCap metadata for {len(redcap_metadata)} fields")
+            else:
+                logger.info("No REDCap metadata available")
 
-            if df is None or df.empty:
-                logger.error(f"No data found in table {table_name}")
-                return []
+            # Load codebook domains for child development items
+            codebook_domains = codebook_future.result()
+            if codebook_domains:
+                logger.info(f"Loaded codebook domains for {len(codebook_domains)} child development items")
+            else:
+                logger.info("No codebook domain information available")
+
+            # One slot per column, filled in column order; failed columns stay None
+            metadata_list = [None] * len(columns_to_analyze)
+            failed_variables = []
+
+            with PerformanceLogger(logger, "variable_analysis", column_count=len(columns_to_analyze)):
+                # All variables generated in one run share a creation timestamp
+                creation_date = datetime.now().isoformat()
+
+                # Check the level once rather than formatting a debug message per column
+                debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+                # Count factor candidate values for all columns in one query. An
+                # all-missing column has a single missing level, known from its
+                # summary, so it is not scanned again.
+                factor_candidates = [col for col in columns_to_analyze if is_factor_candidate(summaries[col])]
+                candidate_value_counts = query_value_counts(
+                    table_name,
+                    [col for col in factor_candidates if summaries[col]["n_missing"] < summaries[col]["count"]],
+                    db_ops
+                )
+                for col_name in factor_candidates:
+                    if summaries[col_name]["n_missing"] == summaries[col_name]["count"]:
+                        candidate_value_counts[col_name] = {None: summaries[col_name]["count"]}
+
+                for i, col_name in enumerate(columns_to_analyze):
+
+                    try:
+                        with error_context(logger, "variable_analysis", variable=col_name):
+                            if debug_enabled:
+                                logger.debug("Analyzing variable: %s", col_name)
+
+                            var_metadata = build_variable_metadata(
+                                summaries[col_name],
+                                candidate_value_counts.get(col_name),
+                                codebook_domains,
+                                redcap_metadata,
+                                variable_labels,
+                                creation_date
+                            )
+
+                            metadata_list[i] = var_metadata
+
+                    except Exception as var_error:
+                        failed_variables.append({
+                            "variable_name": col_name,
+                            "error": str(var_error),
+                            "error_type": type(var_error).__name__
+                        })
+                        logger.error(
+                            f"Failed to analyze variable {col_name}: {var_error}",
+                            extra={
+                                "variable_name": col_name,
+                                "error_type": type(var_error).__name__,
+                                "error_message": str(var_error)
+                            }
+                        )
+
+            if failed_variables:
+                metadata_list = [var_metadata for var_metadata in metadata_list if var_metadata is not None]
+                logger.warning(
+                    f"Failed to analyze {len(failed_variables)} variables out of {len(table_columns)}",
+                    extra={"failed_variables": failed_variables[:5]}  # Log first 5 failures
+                )
 
             logger.info(
-                f"Analyzing {len(df.columns)} columns from {len(df)} rows (sample of {total_rows} total)",
+                f"Generated metadata for {len(metadata_list)} variables (failed: {len(failed_variables)})",
                 extra={
-                    "table_name": table_name,
-                    "columns_count": len(df.columns),
-                    "sample_rows": len(df),
-                    "total_rows": total_rows
+                    "successful_variables": len(metadata_list),
+                    "failed_variables": len(failed_variables),
+                    "success_rate": len(metadata_list) / len(table_columns) * 100
                 }
             )
+            return metadata_list
 
-        # Load REDCap metadata for enriching variable descriptions
-        logger.info("Loading REDCap data dictionary metadata...")
-        redcap_metadata = load_redcap_metadata(db_ops)
-        if redcap_metadata:
-            logger.info(f"Loaded REDCap metadata for {len(redcap_metadata)} fields")
-        else:
-            logger.info("No REDCap metadata available")
-
-        # Load codebook domains for child development items
-        logger.info("Loading codebook domain classifications...")
-        codebook_domains = load_codebook_domains()
-        if codebook_domains:
-            logger.info(f"Loaded codebook domains for {len(codebook_domains)} child development items")
-        else:
-            logger.info("No codebook domain information available")
-
-        metadata_list = []
-        failed_variables = []
-
-        # Filter columns for analysis
-        columns_to_analyze = df.columns.tolist()
-
-        # Remove excluded columns
-        columns_to_analyze = [col for col in columns_to_analyze if col not in exclude_columns]
-
-        # If derived_variables_list is provided, only analyze those variables
-        if derived_variables_list is not None:
-            # Filter to only include derived variables that exist in the table
-            available_derived = [col for col in derived_variables_list if col in df.columns]
-            columns_to_analyze = available_derived
-            logger.info(f"Filtering to derived variables only: {len(available_derived)} of {len(derived_variables_list)} derived variables found in table")
+        except Exception as e:
+            logger.error(
+                f"Error generating metadata for {table_name}: {e}",
+                extra={
+                    "table_name": table_name,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "traceback": traceback.format_exc()
+                }
+            )
+            return []
 
-        with PerformanceLogger(logger, "variable_analysis", column_count=len(columns_to_analyze)):
-            for col_name in columns_to_analyze:
 
-                try:
-                    with error_context(logger, "variable_analysis", variable=col_name):
-                        logger.debug(f"Analyzing variable: {col_name}")
+def metadata_to_dataframe(metadata_list: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Convert metadata records to a DataFrame column by column.
 
-                        # Generate basic metadata
-                        var_metadata = analyze_variable(df[col_name], col_name)
+    Records do not all carry the same fields (factor and REDCap fields are
+    optional), so the columns are the union of keys in first-seen order and
+    absent fields become missing values. Building one list per column lets
+    pandas create each column directly instead of transposing row dicts.
 
-                        # Add category with priority: codebook domain > simple categorization
-                        if col_name in codebook_domains:
-                            # Use codebook domain for child development items
-                            category = codebook_domains[col_name]
-                            var_metadata["category"] = category
-                            var_metadata["domain_source"] = "codebook"
-                        else:
-                            # Use simple categorization for other variables
-                            category = categorize_variable(col_name)
-                            var_metadata["category"] = category
-                            var_metadata["domain_source"] = "auto"
-
-                        # Set variable label with priority: REDCap > YAML config > auto-generated
-                        if col_name in redcap_metadata and redcap_metadata[col_name]['field_label']:
-                            # Use REDCap field label (original survey question)
-                            var_metadata["variable_label"] = redcap_metadata[col_name]['field_label']
-
-                            # Add REDCap field note if available
-                            if redcap_metadata[col_name]['field_note']:
-                                var_metadata["field_note"] = redcap_metadata[col_name]['field_note']
-
-                            # Add REDCap field type
-                            if redcap_metadata[col_name]['field_type']:
-                                var_metadata["redcap_field_type"] = redcap_metadata[col_name]['field_type']
-
-                            # Add form name for context
-                            if redcap_metadata[col_name]['form_name']:
-                                var_metadata["redcap_form"] = redcap_metadata[col_name]['form_name']
-
-                            # Add REDCap response options if available
-                            if redcap_metadata[col_name]['response_options']:
-                                # Store as JSON string for database compatibility
-                                var_metadata["redcap_response_options"] = json.dumps(
-                                    redcap_metadata[col_name]['response_options'],
-                                    ensure_ascii=False
-                                )
-
-                        elif col_name in variable_labels:
-                            # Use custom label from YAML config (derived variables)
-                            var_metadata["variable_label"] = variable_labels[col_name]
-                        else:
-                            # Auto-generate label from variable name
-                            var_metadata["variable_label"] = col_name.replace('_', ' ').title()
-
-                        var_metadata["transformation_notes"] = generate_transformation_notes(col_name, category)
-                        var_metadata["creation_date"] = datetime.now().isoformat()
-
-                        # Add empty fields for compatibility (only if not already set by factor analysis)
-                        if "summary_statistics" not in var_metadata:
-                            var_metadata["summary_statistics"] = "{}"
-                        if "value_labels" not in var_metadata:
-                            var_metadata["value_labels"] = "{}"
-
-                        metadata_list.append(var_metadata)
-
-                except Exception as var_error:
-                    failed_variables.append({
-                        "variable_name": col_name,
-                        "error": str(var_error),
-                        "error_type": type(var_error).__name__
-                    })
-                    logger.error(
-                        f"Failed to analyze variable {col_name}: {var_error}",
-                        extra={
-                            "variable_name": col_name,
-                            "error_type": type(var_error).__name__,
-                            "error_message": str(var_error)
-                        }
-                    )
-
-        if failed_variables:
-            logger.warning(
-                f"Failed to analyze {len(failed_variables)} variables out of {len(df.columns)}",
-                extra={"failed_variables": failed_variables[:5]}  # Log first 5 failures
-            )
+    Args:
+        metadata_list: List of metadata dictionaries
 
-        logger.info(
-            f"Generated metadata for {len(metadata_list)} variables (failed: {len(failed_variables)})",
-            extra={
-                "successful_variables": len(metadata_list),
-                "failed_variables": len(failed_variables),
-                "success_rate": len(metadata_list) / len(df.columns) * 100
-            }
-        )
-        return metadata_list
+    Returns:
+        DataFrame with one row per variable
+    """
+    columns = {}
+    for record in metadata_list:
+        for key in record:
+            columns.setdefault(key, None)
 
-    except Exception as e:
-        logger.error(
-            f"Error generating metadata for {table_name}: {e}",
-            extra={
-                "table_name": table_name,
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "traceback": traceback.format_exc()
-            }
-        )
-        return []
+    return pd.DataFrame({
+        key: [record.get(key) for record in metadata_list]
+        for key in columns
+    })
 
 
 @with_logging("export_metadata_to_feather")
@@ -829,7 +1203,7 @@ def export_metadata_to_feather(
 
         # Convert to DataFrame with validation
         logger.info(f"Converting {len(metadata_list)} metadata records to DataFrame")
-        df = pd.DataFrame(metadata_list)
+        df = metadata_to_dataframe(metadata_list)
 
         # Validate DataFrame structure
         required_columns = ['variable_name', 'data_type', 'category']
@@ -846,9 +1220,11 @@ def export_metadata_to_feather(
             }
         )
 
-        # Export to Feather with data type preservation
+        # Export to Feather with data type preservation. The file is small and read
+        # back straight away, so skip LZ4 compression and convert columns in parallel
         logger.info(f"Exporting metadata to Feather file: {output_path}")
-        df.to_feather(output_path)
+        metadata_table = pa.Table.from_pandas(df, preserve_index=False, nthreads=os.cpu_count())
+        feather.write_feather(metadata_table, output_path, compression="uncompressed")
 
         # Verify export
         file_size = output_file.stat().st_size
@@ -877,11 +1253,16 @@ def export_metadata_to_feather(
         return False
 
 
+# Metadata columns that take one of a handful of values across all variables
+CATEGORICAL_METADATA_COLUMNS = ('category', 'data_type', 'storage_mode')
+
+
 @with_logging("insert_metadata")
 def insert_metadata(
     metadata_list: List[Dict[str, Any]],
     db_ops: DatabaseOperations,
-    table_name: str = "ne25_metadata"
+    table_name: str = "ne25_metadata",
+    table_catalog: Optional[Dict[str, Optional[int]]] = None
 ) -> bool:
     """
     Insert metadata into the database.
@@ -890,6 +1271,7 @@ def insert_metadata(
         metadata_list: List of metadata dictionaries
         db_ops: Database operations instance
         table_name: Target metadata table name
+        table_catalog: Known tables from get_table_catalog (queried if not given)
 
     Returns:
         True if successful, False otherwise
@@ -911,7 +1293,7 @@ def insert_metadata(
         with error_context(logger, "metadata_insertion", table_name=table_name, record_count=len(metadata_list)):
             # Convert to DataFrame with validation
             logger.info(f"Converting {len(metadata_list)} metadata records to DataFrame")
-            df = pd.DataFrame(metadata_list)
+            df = metadata_to_dataframe(metadata_list)
 
             # Validate DataFrame structure
             required_columns = ['variable_name', 'data_type', 'category']
@@ -930,40 +1312,56 @@ def insert_metadata(
 
             # Clear existing metadata
             logger.info(f"Clearing existing metadata from {table_name}")
-            with db_ops.db_manager.get_connection() as conn:
-                if db_ops.table_exists(table_name):
-                    initial_count = db_ops.get_table_count(table_name)
-                    conn.execute(f"DELETE FROM {table_name}")
-                    logger.info(f"Deleted {initial_count} existing records from {table_name}")
+            if table_catalog is None:
+                table_catalog = get_table_catalog(db_ops)
+            if table_name in table_catalog:
+                estimated_count = table_catalog[table_name]
+                logger.info(f"Replacing about {estimated_count} existing records in {table_name} (estimated)")
+
+            # Low-cardinality label columns as categoricals (dictionary-encoded), the
+            # rest as Arrow-backed columns, so DuckDB scans the frame without
+            # converting each Python string object
+            df = df.astype({col: "category" for col in CATEGORICAL_METADATA_COLUMNS if col in df.columns})
+            df = df.convert_dtypes(dtype_backend="pyarrow", convert_integer=False)
+
+            # Hand DuckDB an Arrow table, which it scans natively in one bulk
+            # CREATE TABLE AS; the pyarrow-backed columns convert without copying
+            try:
+                metadata_source = pa.Table.from_pandas(df, preserve_index=False)
+            except pa.ArrowException:
+                # Mixed-type object columns have no single Arrow type
+                metadata_source = df
 
             # Insert new metadata
             logger.info(f"Inserting {len(df)} metadata records into {table_name}")
 
             with PerformanceLogger(logger, "metadata_database_insertion", records=len(df)):
-                success = db_ops.insert_dataframe(
-                    df=df,
-                    table_name=table_name,
-                    if_exists="replace",
-                    chunk_size=100
-                )
+                with db_ops.db_manager.get_connection() as conn:
+                    conn.register("meta_df", metadata_source)
+                    try:
+                        # Store categoricals as VARCHAR (older DuckDB versions map them to ENUM)
+                        replace_clause = ", ".join(
+                            f"CAST({col} AS VARCHAR) AS {col}"
+                            for col in CATEGORICAL_METADATA_COLUMNS if col in df.columns
+                        )
+                        # CREATE TABLE AS reports the number of rows it wrote
+                        final_count = conn.execute(
+                            f"CREATE OR REPLACE TABLE {table_name} AS "
+                            f"SELECT * REPLACE ({replace_clause}) FROM meta_df"
+                        ).fetchone()[0]
+                    finally:
+                        conn.unregister("meta_df")
 
-            if success:
-                final_count = db_ops.get_table_count(table_name)
-                logger.info(
-                    f"Successfully inserted metadata. Table {table_name} now has {final_count} rows",
-                    extra={
-                        "table_name": table_name,
-                        "records_inserted": len(df),
-                        "final_count": final_count
-                    }
-                )
-            else:
-                logger.error(
-                    f"Failed to insert metadata into {table_name}",
-                    extra={"table_name": table_name, "attempted_records": len(df)}
-                )
+            logger.info(
+                f"Successfully inserted metadata. Table {table_name} now has {final_count} rows",
+                extra={
+                    "table_name": table_name,
+                    "records_inserted": len(df),
+                    "final_count": final_count
+                }
+            )
 
-            return success
+            return True
 
     except Exception as e:
         logger.error(
@@ -1081,11 +1479,15 @@ Examples:
             if not db_manager.test_connection():
                 raise ConnectionError("Database connection test failed")
 
+            # Read the table catalog once; later existence checks reuse it
+            table_catalog = get_table_catalog(db_ops)
+
             # Check if source table exists
-            if not db_ops.table_exists(args.source_table):
+            if args.source_table not in table_catalog:
                 raise ValueError(f"Source table {args.source_table} does not exist")
 
-            # Check source table has data
+            # Check source table has data; the catalog's estimated size still
+            # counts deleted rows, so take an exact count
             row_count = db_ops.get_table_count(args.source_table)
             if row_count == 0:
                 raise ValueError(f"Source table {args.source_table} is empty")
@@ -1122,7 +1524,8 @@ Examples:
                 args.source_table,
                 db_ops,
                 derived_variables_list=derived_variables_list,
-                variable_labels=variable_labels
+                variable_labels=variable_labels,
+                table_catalog=table_catalog
             )
 
             if not metadata_list:
@@ -1154,7 +1557,7 @@ Examples:
             success = True
         else:
             with PerformanceLogger(logger, "metadata_insertion", records=len(metadata_list)):
-                success = insert_metadata(metadata_list, db_ops, args.metadata_table)
+                success = insert_metadata(metadata_list, db_ops, args.metadata_table, table_catalog)
 
         if success:
             logger.info(
@@ -12,8 +12,12 @@ data type preservation for R/Python interoperability.
 import sys
 import argparse
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 # Add python module to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "python"))
@@ -28,11 +32,181 @@ except ImportError:
         return logging.getLogger()
 
 
+def quote_identifier(name: str) -> str:
+    """Quote a column name for use in DuckDB SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def enum_casts(table: pa.Table) -> Dict[str, str]:
+    """
+    Build the casts that store string dictionary columns as ENUMs.
+
+    DuckDB scans Arrow dictionary columns (R factors written to Feather/Parquet)
+    as VARCHAR, while the pandas categoricals they used to be converted to were
+    stored as ENUMs. Casting them keeps the factor levels and their order.
+
+    Args:
+        table: Arrow table about to be registered with DuckDB
+
+    Returns:
+        Dictionary mapping column names to their CAST expressions
+    """
+    casts = {}
+    for field in table.schema:
+        if not (pa.types.is_dictionary(field.type) and (
+            pa.types.is_string(field.type.value_type)
+            or pa.types.is_large_string(field.type.value_type)
+        )):
+            continue
+
+        column = table.column(field.name).unify_dictionaries()
+        levels = column.chunk(0).dictionary.to_pylist() if column.num_chunks else []
+        if not levels:
+            continue
+
+        enum_values = ", ".join("'" + level.replace("'", "''") + "'" for level in levels)
+        casts[field.name] = f"CAST({quote_identifier(field.name)} AS ENUM({enum_values}))"
+
+    return casts
+
+
+def replace_clause(expressions: Dict[str, str]) -> str:
+    """
+    Build a SELECT * REPLACE clause from column replacement expressions.
+
+    Args:
+        expressions: Dictionary mapping column names to replacement expressions
+
+    Returns:
+        " REPLACE (...)" clause to append to "SELECT *", or "" if not needed
+    """
+    if not expressions:
+        return ""
+    items = ", ".join(f"{expr} AS {quote_identifier(name)}" for name, expr in expressions.items())
+    return f" REPLACE ({items})"
+
+
+# Feather files at least this large are decoded with multiple threads; below
+# it, thread coordination costs more than it saves
+FEATHER_THREADED_MIN_BYTES = 64 * 1024 * 1024
+
+# DuckDB table functions used to scan data files in place, by suffix
+FILE_READERS = {
+    '.parquet': "read_parquet(?)",
+    '.csv': "read_csv(?, sample_size=-1)",
+}
+
+
+def replace_table(
+    db_ops: DatabaseOperations,
+    table_name: str,
+    source: Union[pa.Table, pd.DataFrame, Path],
+    select_list: str = "*",
+    params: Optional[List[Any]] = None,
+    keep_empty: bool = True
+) -> int:
+    """
+    Replace a table with the contents of an Arrow table, DataFrame or data file in one statement.
+
+    In-memory sources are registered with DuckDB and scanned in place by a single
+    CREATE OR REPLACE TABLE ... AS SELECT, instead of being appended in chunks.
+    Parquet and CSV paths are scanned directly with DuckDB's readers.
+
+    Args:
+        db_ops: Database operations instance
+        table_name: Target table name
+        source: Arrow table, DataFrame, or path to a Parquet or CSV file
+        select_list: Select list applied to the source (e.g. to add columns)
+        params: Query parameters referenced by select_list
+        keep_empty: If False, the replacement is rolled back when the source
+            has no rows, leaving the existing table untouched
+
+    Returns:
+        Number of rows in the source
+    """
+    with db_ops.db_manager.get_connection() as conn:
+        if isinstance(source, Path):
+            relation = FILE_READERS[source.suffix.lower()]
+            params = (params or []) + [str(source)]
+        else:
+            relation = "source_data"
+            conn.register(relation, source)
+
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            n_rows = conn.execute(
+                f"CREATE OR REPLACE TABLE {table_name} AS SELECT {select_list} FROM {relation}",
+                params
+            ).fetchone()[0]
+            conn.execute("COMMIT" if n_rows or keep_empty else "ROLLBACK")
+            return n_rows
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            if not isinstance(source, Path):
+                conn.unregister(relation)
+
+
+def inspect_parquet(data_path: Path) -> Tuple[int, List[str], Dict[str, str]]:
+    """
+    Get the size and columns of a Parquet file and the ENUM casts for loading it.
+
+    Counts come from the file footer. Only dictionary-encoded (factor)
+    columns are read, to build their ENUM casts.
+
+    Args:
+        data_path: Path to the Parquet file
+
+    Returns:
+        Tuple of (row count, column names, ENUM casts as returned by enum_casts)
+    """
+    parquet_file = pq.ParquetFile(data_path)
+    n_rows = parquet_file.metadata.num_rows
+    schema = parquet_file.schema_arrow
+    factor_columns = [field.name for field in schema if pa.types.is_dictionary(field.type)]
+
+    casts = {}
+    if factor_columns and n_rows:
+        casts = enum_casts(parquet_file.read(columns=factor_columns))
+    return n_rows, schema.names, casts
+
+
+def read_source_data(data_path: Path) -> Optional[Union[pa.Table, pd.DataFrame]]:
+    """
+    Read a Parquet, Feather or CSV file for insertion.
+
+    Parquet and Feather files are read straight into Arrow tables, which DuckDB
+    scans without a pandas conversion. Feather files are memory-mapped and only
+    decoded with threads when large. CSV files keep pandas type inference.
+    Raw Parquet and CSV inserts bypass this and let DuckDB read the file.
+
+    Args:
+        data_path: Path to the data file
+
+    Returns:
+        Arrow table (Parquet/Feather), DataFrame (CSV), or None if the format is unsupported
+    """
+    suffix = data_path.suffix.lower()
+    if suffix == '.parquet':
+        return pq.read_table(data_path)
+    if suffix == '.feather':
+        return feather.read_table(
+            data_path,
+            memory_map=True,
+            use_threads=data_path.stat().st_size >= FEATHER_THREADED_MIN_BYTES
+        )
+    if suffix == '.csv':
+        return pd.read_csv(data_path)
+    return None
+
+
 def insert_raw_data(
     data_file: str,
     table_name: str,
     db_ops: DatabaseOperations,
-    pid: int = None
+    pid: int = None,
+    use_pandas: bool = False
 ) -> bool:
     """
     Insert raw data from CSV, Parquet, or Feather file into database table.
@@ -42,6 +216,7 @@ def insert_raw_data(
         table_name: Target table name
         db_ops: Database operations instance
         pid: Project ID (for logging)
+        use_pandas: Parse CSV files with pandas instead of DuckDB's CSV reader
 
     Returns:
         True if successful, False otherwise
@@ -57,42 +232,43 @@ def insert_raw_data(
 
         logger.info(f"Reading data from: {data_file}")
 
-        # Determine file format and read accordingly
-        if data_path.suffix.lower() == '.parquet':
-            df = pd.read_parquet(data_file)
-            logger.info(f"Read Parquet file with preserved data types")
-        elif data_path.suffix.lower() == '.feather':
-            df = pd.read_feather(data_file)
-            logger.info(f"Read Feather file with optimal data type preservation")
-        elif data_path.suffix.lower() == '.csv':
-            df = pd.read_csv(data_file)
-            logger.info(f"Read CSV file with inferred data types")
-        else:
-            logger.error(f"Unsupported file format: {data_path.suffix}")
-            return False
+        # Determine file format and read accordingly. Parquet and CSV files are
+        # scanned by DuckDB itself; only Parquet factor columns are read through
+        # Arrow, for the ENUM levels.
+        suffix = data_path.suffix.lower()
+        if suffix == '.csv' and not use_pandas:
+            logger.info(f"Inserting data into table: {table_name}")
+            final_count = replace_table(db_ops, table_name, data_path, keep_empty=False)
+            if final_count == 0:
+                logger.warning(f"No data found in {data_file}")
+                return True
+            logger.info(f"Successfully inserted data. Table {table_name} now has {final_count} rows")
+            return True
 
-        if df.empty:
+        if suffix == '.parquet':
+            source = data_path
+            n_rows, columns, casts = inspect_parquet(data_path)
+            n_columns = len(columns)
+        else:
+            source = read_source_data(data_path)
+            if source is None:
+                logger.error(f"Unsupported file format: {data_path.suffix}")
+                return False
+            n_rows, n_columns = len(source), len(source.columns)
+            casts = enum_casts(source) if isinstance(source, pa.Table) and n_rows else {}
+
+        if n_rows == 0:
             logger.warning(f"No data found in {data_file}")
             return True
 
-        logger.info(f"Loaded {len(df)} records with {len(df.columns)} columns")
+        logger.info(f"Loaded {n_rows} records with {n_columns} columns")
 
         # Insert data
         logger.info(f"Inserting data into table: {table_name}")
-        success = db_ops.insert_dataframe(
-            df=df,
-            table_name=table_name,
-            if_exists="replace",
-            chunk_size=500
-        )
-
-        if success:
-            final_count = db_ops.get_table_count(table_name)
-            logger.info(f"Successfully inserted data. Table {table_name} now has {final_count} rows")
-        else:
-            logger.error(f"Failed to insert data into {table_name}")
+        final_count = replace_table(db_ops, table_name, source, "*" + replace_clause(casts))
 
-        return success
+        logger.info(f"Successfully inserted data. Table {table_name} now has {final_count} rows")
+        return True
 
     except Exception as e:
         logger.error(f"Error inserting raw data: {e}")
@@ -106,10 +282,10 @@ def insert_dictionary_data(
     pid: int
 ) -> bool:
     """
-    Insert data dictionary from CSV file into database table.
+    Insert data dictionary from CSV, Feather, or Parquet file into database table.
 
     Args:
-        dictionary_file: Path to CSV file with dictionary data
+        dictionary_file: Path to CSV, Feather, or Parquet file with dictionary data
         table_name: Target table name
         db_ops: Database operations instance
         pid: Project ID
@@ -128,39 +304,58 @@ def insert_dictionary_data(
 
         logger.info(f"Reading dictionary from: {dictionary_file}")
 
-        # Support both CSV and Feather formats for dictionaries
-        if dict_path.suffix.lower() == '.feather':
-            df = pd.read_feather(dictionary_file)
-        elif dict_path.suffix.lower() == '.csv':
-            df = pd.read_csv(dictionary_file)
+        # Support CSV, Feather and Parquet formats for dictionaries; Parquet
+        # files are scanned by DuckDB directly
+        suffix = dict_path.suffix.lower()
+        if suffix == '.parquet':
+            source = dict_path
+            n_rows, columns, casts = inspect_parquet(dict_path)
+        elif suffix in ('.feather', '.csv'):
+            source = read_source_data(dict_path)
+            n_rows = len(source)
+            if isinstance(source, pa.Table):
+                columns = source.column_names
+                casts = enum_casts(source) if n_rows else {}
+            else:
+                columns, casts = list(source.columns), {}
         else:
             logger.error(f"Unsupported dictionary file format: {dict_path.suffix}")
             return False
 
-        if df.empty:
+        if n_rows == 0:
             logger.warning(f"No dictionary data found in {dictionary_file}")
             return True
 
-        # Add PID column
-        df['pid'] = pid
-        df['created_at'] = pd.Timestamp.now()
-
-        logger.info(f"Loaded {len(df)} dictionary fields for PID {pid}")
-
-        # Insert data
-        success = db_ops.insert_dataframe(
-            df=df,
-            table_name=table_name,
-            if_exists="replace",
-            chunk_size=500
+        logger.info(f"Loaded {n_rows} dictionary fields for PID {pid}")
+
+        # Insert data, setting the PID and load timestamp columns in the SELECT.
+        # A source column of the same name is overwritten in place; otherwise
+        # the column is appended.
+        existing = {column.lower(): column for column in columns}
+        appended, replace_params, append_params = [], [], []
+        for name, expr, value in (
+            ("pid", "CAST(? AS BIGINT)", pid),
+            ("created_at", "CAST(? AS TIMESTAMP)", datetime.now()),
+        ):
+            if name in existing:
+                # Re-inserted last, so its parameter follows any earlier ones
+                casts.pop(existing[name], None)
+                casts[existing[name]] = expr
+                replace_params.append(value)
+            else:
+                appended.append(f", {expr} AS {name}")
+                append_params.append(value)
+
+        replace_table(
+            db_ops,
+            table_name,
+            source,
+            "*" + replace_clause(casts) + "".join(appended),
+            replace_params + append_params
         )
 
-        if success:
-            logger.info(f"Successfully inserted dictionary data for PID {pid}")
-        else:
-            logger.error(f"Failed to insert dictionary data for PID {pid}")
-
-        return success
+        logger.info(f"Successfully inserted dictionary data for PID {pid}")
+        return True
 
     except Exception as e:
         logger.error(f"Error inserting dictionary data: {e}")
@@ -205,13 +400,11 @@ def insert_eligibility_data(
         success = db_ops.upsert_data(
             df=df,
             table_name=table_name,
-            key_columns=['record_id', 'pid', 'retrieved_date'],
-            chunk_size=500
+            key_columns=['record_id', 'pid', 'retrieved_date']
         )
 
         if success:
-            final_count = db_ops.get_table_count(table_name)
-            logger.info(f"Successfully upserted eligibility data. Table {table_name} now has {final_count} rows")
+            logger.info(f"Successfully upserted eligibility data into {table_name}")
         else:
             logger.error(f"Failed to upsert eligibility data into {table_name}")
 
@@ -246,6 +439,11 @@ def main():
         type=int,
         help="Project ID (required for dictionary data)"
     )
+    parser.add_argument(
+        "--use-pandas",
+        action="store_true",
+        help="Parse raw CSV files with pandas instead of DuckDB's CSV reader"
+    )
     parser.add_argument(
         "--config",
         default="config/sources/ne25.yaml",
@@ -275,7 +473,9 @@ def main():
 
         # Insert data based on type
         if args.data_type == "raw":
-            success = insert_raw_data(args.data_file, args.table_name, db_ops, args.pid)
+            success = insert_raw_data(
+                args.data_file, args.table_name, db_ops, args.pid, use_pandas=args.use_pandas
+            )
         elif args.data_type == "dictionary":
             if not args.pid:
                 logger.error("PID is required for dictionary data")
@@ -4,10 +4,37 @@ Load geographic crosswalks using direct SQL COPY commands.
 Simpler approach to avoid segmentation faults.
 """
 
+import os
 import sys
 import duckdb
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+
+def load_crosswalk(conn, xwalk):
+    """Replace one crosswalk table from its CSV on a separate cursor; returns (count, error)."""
+    cursor = conn.cursor()
+    try:
+        # Replace the table from CSV with filter in one statement, which
+        # returns the number of rows written
+        # Skip row 2 (descriptions) by reading all then filtering
+        count = cursor.execute(f"""
+            CREATE OR REPLACE TABLE {xwalk['table']} AS
+            SELECT *
+            FROM read_csv_auto('{xwalk['file']}',
+                header=true,
+                skip=1,
+                encoding='latin-1',
+                all_varchar=true)
+            WHERE {xwalk['filter']}
+        """).fetchone()[0]
+        return count, None
+    except Exception as e:
+        return None, e
+    finally:
+        cursor.close()
+
+
 def main():
     """Load crosswalks using SQL COPY."""
 
@@ -75,39 +102,21 @@ def main():
     successful = 0
     failed = 0
 
-    for xwalk in crosswalks:
+    # The crosswalks are independent (different files and tables), so they
+    # load concurrently; results are reported in the order listed above
+    with ThreadPoolExecutor(max_workers=min(len(crosswalks), os.cpu_count() or 1)) as executor:
+        results = list(executor.map(lambda xwalk: load_crosswalk(conn, xwalk), crosswalks))
+
+    for xwalk, (count, error) in zip(crosswalks, results):
         table = xwalk['table']
-        file = xwalk['file']
-        filter_cond = xwalk['filter']
 
         print(f"\n--- Loading {table} ---")
 
-        try:
-            # Drop existing table
-            conn.execute(f"DROP TABLE IF EXISTS {table}")
-
-            # Create table from CSV with filter
-            # Skip row 2 (descriptions) by reading all then filtering
-            conn.execute(f"""
-                CREATE TABLE {table} AS
-                SELECT *
-                FROM read_csv_auto('{file}',
-                    header=true,
-                    skip=1,
-                    encoding='latin-1',
-                    all_varchar=true)
-                WHERE {filter_cond}
-            """)
-
-            # Get count
-            result = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
-            count = result[0]
-
+        if error is None:
             print(f"[OK] Loaded {count:,} rows into {table}")
             successful += 1
-
-        except Exception as e:
-            print(f"[FAIL] Failed to load {table}: {e}")
+        else:
+            print(f"[FAIL] Failed to load {table}: {error}")
             failed += 1
 
     # Summary
@@ -122,9 +131,16 @@ def main():
     print(f"\n{'='*60}")
     print("ALL TABLES IN DATABASE")
     print(f"{'='*60}")
+    # Tables loaded above reuse the row count CREATE OR REPLACE returned
+    loaded_counts = {
+        xwalk['table']: count
+        for xwalk, (count, error) in zip(crosswalks, results) if error is None
+    }
     tables = conn.execute("SHOW TABLES").fetchall()
     for table in sorted(tables):
-        count = conn.execute(f"SELECT COUNT(*) FROM {table[0]}").fetchone()[0]
+        count = loaded_counts.get(table[0])
+        if count is None:
+            count = conn.execute(f"SELECT COUNT(*) FROM {table[0]}").fetchone()[0]
         print(f"  {table[0]}: {count:,} rows")
 
     conn.close()
@@ -23,7 +23,7 @@ import sys
 import argparse
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Add python module to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "python"))
@@ -184,7 +184,8 @@ def create_indexes(db_ops: DatabaseOperations, table_names: List[str]) -> bool:
 def load_all_crosswalks(
     db_ops: DatabaseOperations,
     state_filter: str = 'NE',
-    if_exists: str = 'replace'
+    if_exists: str = 'replace',
+    chunk_size: Optional[int] = None
 ) -> Tuple[int, int]:
     """
     Load all geographic crosswalk files into DuckDB.
@@ -193,6 +194,7 @@ def load_all_crosswalks(
         db_ops: Database operations instance
         state_filter: State abbreviation to filter on
         if_exists: What to do if tables exist ('replace', 'append', 'fail')
+        chunk_size: Rows per insert batch (default: row count clamped to 10k-50k)
 
     Returns:
         Tuple of (successful_count, failed_count)
@@ -227,7 +229,7 @@ def load_all_crosswalks(
             df=df,
             table_name=table_name,
             if_exists=if_exists,
-            chunk_size=1000
+            chunk_size=chunk_size or max(10_000, min(50_000, len(df)))
         )
 
         if success:
@@ -282,6 +284,11 @@ def main():
         choices=['replace', 'append', 'fail'],
         help='What to do if tables exist (default: replace)'
     )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        help='Rows per insert batch (default: row count clamped to 10,000-50,000)'
+    )
     parser.add_argument(
         '--log-level',
         default='INFO',
@@ -308,7 +315,8 @@ def main():
         successful, failed = load_all_crosswalks(
             db_ops=db_ops,
             state_filter=args.state,
-            if_exists=args.if_exists
+            if_exists=args.if_exists,
+            chunk_size=args.chunk_size
         )
 
         # Exit with appropriate code
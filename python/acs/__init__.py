@@ -28,7 +28,7 @@ VERSION = __version__
 # Convenience imports
 from python.acs.auth import get_client, read_api_key
 from python.acs.config_manager import get_state_config, load_config, validate_config
-from python.acs.extract_manager import get_or_submit_extract
+from python.acs.extract_manager import get_or_submit_extract, get_or_submit_extracts
 from python.acs.data_loader import load_and_convert, load_ipums_data, convert_to_feather
 
 __all__ = [
@@ -38,6 +38,7 @@ __all__ = [
     'load_config',
     'validate_config',
     'get_or_submit_extract',
+    'get_or_submit_extracts',
     'load_and_convert',
     'load_ipums_data',
     'convert_to_feather',
@@ -14,10 +14,16 @@ Functions:
     load_cached_extract: Retrieve cached extract with validation
     invalidate_cache: Remove extract from cache
     clear_old_caches: Remove caches older than threshold
+    write_extract_manifest: Record per-extract manifest (signature, sample release, schema)
+    read_extract_manifest: Load an extract's manifest, if any
+    is_manifest_current: Check a cached extract against the current IPUMS sample release
 """
 
 import json
 import hashlib
+import functools
+import threading
+import yaml
 import structlog
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
@@ -30,6 +36,14 @@ log = structlog.get_logger()
 CACHE_ROOT = Path("data/acs/cache")
 CACHE_EXTRACTS_DIR = CACHE_ROOT / "extracts"
 REGISTRY_FILE = CACHE_ROOT / "registry.json"
+MANIFEST_FILENAME = "manifest.json"
+
+# Serializes registry read-modify-write cycles (extracts may be retrieved
+# concurrently, see extract_manager.get_or_submit_extracts)
+_REGISTRY_LOCK = threading.RLock()
+
+# IPUMS sample codes and release dates (source of truth for cache invalidation)
+SAMPLES_CONFIG_PATH = Path("config/sources/acs/samples.yaml")
 
 
 def generate_extract_signature(config: Dict[str, Any]) -> str:
@@ -39,6 +53,13 @@ def generate_extract_signature(config: Dict[str, Any]) -> str:
     identical requests. Two configs with same state, year, variables, and
     filters will produce the same signature.
 
+    The JSON is serialized with sorted keys, so the signature does not depend
+    on dict ordering in the YAML config. Signatures are persisted in the
+    cache registry, so the serialization and hash algorithm must not change:
+    doing so would turn every registered extract into a cache miss (and a
+    ~45 min IPUMS resubmission). Hashing a config of this size takes
+    microseconds, so there is nothing to gain from a faster hash.
+
     Args:
         config: Extract configuration dictionary
 
@@ -53,7 +74,8 @@ def generate_extract_signature(config: Dict[str, Any]) -> str:
     """
     log.debug("Generating extract signature")
 
-    # Extract relevant fields for signature (order matters for reproducibility)
+    # Extract relevant fields for signature (key order is irrelevant -
+    # sort_keys below canonicalizes it; list order within groups is kept)
     signature_components = {
         'state': config.get('state'),
         'state_fip': config.get('state_fip'),
@@ -90,6 +112,15 @@ def generate_extract_signature(config: Dict[str, Any]) -> str:
     return signature
 
 
+def _with_registry_lock(func):
+    """Run func while holding the registry lock."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _REGISTRY_LOCK:
+            return func(*args, **kwargs)
+    return wrapper
+
+
 def _load_registry() -> Dict[str, Any]:
     """Load cache registry from JSON file.
 
@@ -178,6 +209,7 @@ def check_cache_exists(extract_signature: str) -> Optional[str]:
     return None
 
 
+@_with_registry_lock
 def register_extract(
     extract_signature: str,
     extract_id: str,
@@ -232,8 +264,13 @@ def register_extract(
     if metadata:
         entry.update(metadata)
 
-    # Add to registry
-    registry.setdefault('extracts', []).append(entry)
+    # Add to registry, replacing older extracts with the same signature
+    # (stale or force-refreshed) so check_cache_exists finds this one
+    registry['extracts'] = [
+        existing for existing in registry.get('extracts', [])
+        if existing.get('extract_signature') != extract_signature
+    ]
+    registry['extracts'].append(entry)
 
     # Save registry
     _save_registry(registry)
@@ -298,6 +335,7 @@ def load_cached_extract(extract_id: str, validate: bool = True) -> Dict[str, str
     return file_paths
 
 
+@_with_registry_lock
 def invalidate_cache(extract_id: str, delete_files: bool = False) -> bool:
     """Remove extract from cache registry.
 
@@ -352,6 +390,7 @@ def invalidate_cache(extract_id: str, delete_files: bool = False) -> bool:
     return True
 
 
+@_with_registry_lock
 def clear_old_caches(days: int = 365, dry_run: bool = False) -> int:
     """Remove cache entries older than threshold.
 
@@ -409,3 +448,144 @@ def clear_old_caches(days: int = 365, dry_run: bool = False) -> int:
 
     log.info("Cache cleanup complete", removed=removed_count, dry_run=dry_run)
     return removed_count
+
+
+def _extract_dir(extract_id: str) -> Path:
+    """Cache directory for an extract (same layout as download_extract)."""
+    return CACHE_EXTRACTS_DIR / extract_id.replace(":", "_")
+
+
+def get_sample_release(acs_sample: Optional[str]) -> Optional[str]:
+    """Look up the IPUMS release date for a sample code in samples.yaml.
+
+    Args:
+        acs_sample: IPUMS sample code (e.g., "us2023b")
+
+    Returns:
+        Optional[str]: Release date (e.g., "2024-12"), or None if unknown
+    """
+    if not acs_sample or not SAMPLES_CONFIG_PATH.exists():
+        return None
+
+    with open(SAMPLES_CONFIG_PATH, 'r', encoding='utf-8') as f:
+        samples = yaml.safe_load(f) or {}
+
+    for group in ('acs_5year', 'acs_1year'):
+        for sample in (samples.get(group) or {}).values():
+            if sample.get('code') == acs_sample:
+                release = sample.get('release_date')
+                return str(release) if release is not None else None
+
+    return None
+
+
+def write_extract_manifest(
+    extract_id: str,
+    extract_signature: str,
+    acs_sample: Optional[str],
+    row_count: Optional[int] = None,
+    schema_fingerprint: Optional[str] = None
+) -> Path:
+    """Write manifest.json next to a cached extract's files.
+
+    The manifest records which IPUMS sample release the cached files came
+    from, so a later run can detect that IPUMS has re-released the sample
+    without resorting to --force-refresh.
+
+    Args:
+        extract_id: IPUMS extract ID (e.g., "usa:12345")
+        extract_signature: SHA256 signature from generate_extract_signature()
+        acs_sample: IPUMS sample code
+        row_count: Number of records in the extract (optional)
+        schema_fingerprint: Hash of column names/types (optional)
+
+    Returns:
+        Path: Manifest file path
+    """
+    extract_dir = _extract_dir(extract_id)
+    extract_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {
+        'extract_id': extract_id,
+        'extract_signature': extract_signature,
+        'acs_sample': acs_sample,
+        'sample_release': get_sample_release(acs_sample),
+        'row_count': row_count,
+        'schema_fingerprint': schema_fingerprint,
+        'written_timestamp': datetime.utcnow().isoformat() + "Z",
+    }
+
+    manifest_path = extract_dir / MANIFEST_FILENAME
+    temp_file = manifest_path.with_suffix('.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    temp_file.replace(manifest_path)
+
+    log.debug("Extract manifest written", extract_id=extract_id, path=str(manifest_path))
+    return manifest_path
+
+
+def read_extract_manifest(extract_id: str) -> Optional[Dict[str, Any]]:
+    """Load an extract's manifest.json.
+
+    Args:
+        extract_id: IPUMS extract ID
+
+    Returns:
+        Optional[Dict]: Manifest contents, or None if missing/unreadable
+    """
+    manifest_path = _extract_dir(extract_id) / MANIFEST_FILENAME
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, IOError) as e:
+        log.warning("Failed to read extract manifest", extract_id=extract_id, error=str(e))
+        return None
+
+
+def is_manifest_current(extract_id: str, acs_sample: Optional[str]) -> bool:
+    """Check whether a cached extract matches the current IPUMS sample release.
+
+    Extracts cached before manifests existed (no manifest.json) are treated
+    as current, as are samples without a known release date.
+
+    Args:
+        extract_id: IPUMS extract ID
+        acs_sample: IPUMS sample code from the current config
+
+    Returns:
+        bool: False only if the manifest records a different sample release
+    """
+    manifest = read_extract_manifest(extract_id)
+    if manifest is None:
+        return True
+
+    current_release = get_sample_release(acs_sample)
+    if current_release is None:
+        return True
+
+    if manifest.get('sample_release') != current_release:
+        log.info(
+            "Cached extract predates current sample release",
+            extract_id=extract_id,
+            cached_release=manifest.get('sample_release'),
+            current_release=current_release
+        )
+        return False
+
+    return True
+
+
+def schema_fingerprint(columns: Dict[str, Any]) -> str:
+    """Hash column names and types into a short fingerprint.
+
+    Args:
+        columns: Mapping of column name to dtype (e.g., df.dtypes.to_dict())
+
+    Returns:
+        str: First 16 hex characters of the SHA256 digest
+    """
+    json_str = json.dumps([[name, str(dtype)] for name, dtype in columns.items()])
+    return hashlib.sha256(json_str.encode('utf-8')).hexdigest()[:16]
@@ -15,12 +15,14 @@ Functions:
     wait_for_extract: Poll extract status until complete
     download_extract: Download and save extract files
     get_or_submit_extract: Main orchestration with caching
+    get_or_submit_extracts: get_or_submit_extract for several configs concurrently
 """
 
 import time
 import structlog
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from ipumspy import MicrodataExtract, IpumsApiClient
 
 # Import our modules
@@ -31,6 +33,9 @@ from python.acs.cache_manager import (
     check_cache_exists,
     register_extract,
     load_cached_extract,
+    invalidate_cache,
+    is_manifest_current,
+    write_extract_manifest,
     CACHE_EXTRACTS_DIR
 )
 
@@ -408,6 +413,16 @@ def get_or_submit_extract(
     if not force_refresh:
         cached_extract_id = check_cache_exists(extract_signature)
 
+        # Reuse only if cached against the current IPUMS sample release
+        if cached_extract_id and not is_manifest_current(cached_extract_id, config.get('acs_sample')):
+            log.warning(
+                "Cached extract is stale (sample re-released), will submit new extract",
+                extract_id=cached_extract_id
+            )
+            # Drop the stale entry so later runs don't keep finding it
+            invalidate_cache(cached_extract_id)
+            cached_extract_id = None
+
         if cached_extract_id:
             log.info(
                 "Cache HIT - retrieving cached extract",
@@ -473,6 +488,10 @@ def get_or_submit_extract(
         metadata=metadata
     )
 
+    # Record the sample release now; extract_acs_data rewrites the manifest
+    # with row count and schema once the data has been loaded
+    write_extract_manifest(extract_id, extract_signature, config.get('acs_sample'))
+
     log.info(
         "Extract retrieval complete",
         extract_id=extract_id,
@@ -481,3 +500,44 @@ def get_or_submit_extract(
     )
 
     return extract_id, file_paths, False
+
+
+def get_or_submit_extracts(
+    configs: List[Dict[str, Any]],
+    force_refresh: bool = False,
+    max_workers: Optional[int] = None
+) -> List[Tuple[str, Dict[str, str], bool]]:
+    """Retrieve extracts for several configurations concurrently.
+
+    Each config goes through get_or_submit_extract (cache first) in its own
+    worker thread with its own API client. IPUMS processes submitted extracts
+    in parallel, so waiting on N uncached extracts concurrently takes about
+    as long as the slowest one instead of the sum.
+
+    Args:
+        configs: Validated configuration dictionaries (e.g., one per state)
+        force_refresh: If True, bypass cache and submit new extracts
+        max_workers: Maximum concurrent extracts (default: one per config)
+
+    Returns:
+        List of (extract_id, file_paths, from_cache) tuples, in config order
+
+    Raises:
+        Exception: The first error raised for any config (in config order)
+
+    Example:
+        >>> configs = [get_state_config(s, "2019-2023") for s in ["nebraska", "iowa"]]
+        >>> for extract_id, files, cached in get_or_submit_extracts(configs):
+        ...     print(extract_id, cached)
+    """
+    if not configs:
+        return []
+
+    log.info("Retrieving extracts concurrently", count=len(configs), force_refresh=force_refresh)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(configs)) as pool:
+        futures = [
+            pool.submit(get_or_submit_extract, config, force_refresh)
+            for config in configs
+        ]
+        return [future.result() for future in futures]
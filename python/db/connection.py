@@ -18,6 +18,11 @@ try:
     from utils.logging import DatabaseErrorHandler, PerformanceLogger, with_logging
 except ImportError:
     # Fallback for when module structure isn't available
+    from contextlib import nullcontext
+
+    # One shared no-op context manager instead of a new class and instance per call
+    _NULL_CONTEXT = nullcontext()
+
     def DatabaseErrorHandler(logger):
         class DummyHandler:
             def handle_connection_error(self, error, retry_count):
@@ -27,10 +32,7 @@ except ImportError:
         return DummyHandler()
 
     def PerformanceLogger(logger, operation, **kwargs):
-        class DummyContext:
-            def __enter__(self): return self
-            def __exit__(self, *args): pass
-        return DummyContext()
+        return _NULL_CONTEXT
 
     def with_logging(name):
         def decorator(func):
@@ -6,6 +6,7 @@ All operations are designed to replace R DuckDB functionality without segfaults.
 """
 
 import pandas as pd
+import pyarrow as pa
 import duckdb
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
@@ -19,11 +20,13 @@ try:
     from utils.logging import PerformanceLogger, with_logging, error_context
 except ImportError:
     # Fallback for when module structure isn't available
+    from contextlib import nullcontext
+
+    # One shared no-op context manager instead of a new class and instance per call
+    _NULL_CONTEXT = nullcontext()
+
     def PerformanceLogger(logger, operation, **kwargs):
-        class DummyContext:
-            def __enter__(self): return self
-            def __exit__(self, *args): pass
-        return DummyContext()
+        return _NULL_CONTEXT
 
     def with_logging(name):
         def decorator(func):
@@ -31,10 +34,7 @@ except ImportError:
         return decorator
 
     def error_context(logger, operation, **kwargs):
-        class DummyContext:
-            def __enter__(self): return self
-            def __exit__(self, *args): pass
-        return DummyContext()
+        return _NULL_CONTEXT
 
 
 class DatabaseOperations:
@@ -106,95 +106,111 @@ class DatabaseOperations:
 
         try:
             with self.db_manager.get_connection() as conn:
-                with error_context(self.logger, "table_preparation", table_name=table_name):
-                    # Handle different if_exists options
-                    if if_exists == "replace":
-                        conn.execute(f"DROP TABLE IF EXISTS {table_name}")
-                        self.logger.debug(f"Dropped existing table {table_name}")
-                    elif if_exists == "fail":
-                        tables = [row[0] for row in conn.execute("SHOW TABLES").fetchall()]
-                        if table_name in tables:
-                            raise ValueError(f"Table {table_name} already exists")
-
-                # Insert data in chunks for better memory management
-                total_rows = len(df)
-                rows_inserted = 0
-                failed_chunks = []
-
-                with PerformanceLogger(
-                    self.logger,
-                    f"chunked_insertion_{table_name}",
-                    total_rows=total_rows,
-                    chunk_size=chunk_size
-                ):
-                    for i in range(0, total_rows, chunk_size):
-                        chunk_num = i // chunk_size + 1
-                        chunk = df.iloc[i:i + chunk_size]
-
-                        try:
-                            # Use DuckDB's register and INSERT FROM VALUES approach
-                            conn.register("temp_df", chunk)
-
-                            if i == 0 and if_exists in ["replace", "fail"]:
-                                # Create table from first chunk
-                                conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM temp_df")
-                                self.logger.debug(f"Created table {table_name} from first chunk")
-                            else:
-                                # Insert subsequent chunks
-                                conn.execute(f"INSERT INTO {table_name} SELECT * FROM temp_df")
-
-                            conn.unregister("temp_df")
-                            rows_inserted += len(chunk)
-
-                            self.logger.debug(
-                                f"Inserted chunk {chunk_num}/{(total_rows + chunk_size - 1) // chunk_size}",
-                                extra={
-                                    "chunk_number": chunk_num,
-                                    "chunk_rows": len(chunk),
-                                    "total_inserted": rows_inserted,
-                                    "progress_percent": (rows_inserted / total_rows) * 100
-                                }
-                            )
-
-                        except Exception as chunk_error:
-                            failed_chunks.append({
-                                "chunk_number": chunk_num,
-                                "start_row": i,
-                                "end_row": min(i + chunk_size, total_rows),
-                                "error": str(chunk_error)
-                            })
-                            self.logger.error(
-                                f"Failed to insert chunk {chunk_num}: {chunk_error}",
-                                extra={
+                # Table preparation and every chunk share one transaction, so
+                # a failed chunk leaves the table as it was (including a
+                # dropped table in replace mode)
+                conn.execute("BEGIN TRANSACTION")
+                try:
+                    with error_context(self.logger, "table_preparation", table_name=table_name):
+                        # Handle different if_exists options
+                        if if_exists == "replace":
+                            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+                            self.logger.debug(f"Dropped existing table {table_name}")
+                        elif if_exists == "fail":
+                            tables = [row[0] for row in conn.execute("SHOW TABLES").fetchall()]
+                            if table_name in tables:
+                                raise ValueError(f"Table {table_name} already exists")
+
+                    # Insert data in chunks for better memory management
+                    total_rows = len(df)
+                    total_chunks = (total_rows + chunk_size - 1) // chunk_size
+                    rows_inserted = 0
+                    failed_chunk = None
+
+                    with PerformanceLogger(
+                        self.logger,
+                        f"chunked_insertion_{table_name}",
+                        total_rows=total_rows,
+                        chunk_size=chunk_size
+                    ):
+                        for i in range(0, total_rows, chunk_size):
+                            chunk_num = i // chunk_size + 1
+                            chunk = df.iloc[i:i + chunk_size]
+
+                            try:
+                                # Use DuckDB's register and INSERT FROM VALUES approach
+                                conn.register("temp_df", chunk)
+
+                                if i == 0 and if_exists in ["replace", "fail"]:
+                                    # Create table from first chunk
+                                    conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM temp_df")
+                                    self.logger.debug(f"Created table {table_name} from first chunk")
+                                else:
+                                    # Insert subsequent chunks
+                                    conn.execute(f"INSERT INTO {table_name} SELECT * FROM temp_df")
+
+                                rows_inserted += len(chunk)
+
+                                self.logger.debug(
+                                    f"Inserted chunk {chunk_num}/{total_chunks}",
+                                    extra={
+                                        "chunk_number": chunk_num,
+                                        "chunk_rows": len(chunk),
+                                        "total_inserted": rows_inserted,
+                                        "progress_percent": (rows_inserted / total_rows) * 100
+                                    }
+                                )
+
+                            except Exception as chunk_error:
+                                # The transaction is aborted, so later chunks cannot succeed
+                                failed_chunk = {
                                     "chunk_number": chunk_num,
-                                    "chunk_start": i,
-                                    "chunk_size": len(chunk),
-                                    "error_type": type(chunk_error).__name__
+                                    "start_row": i,
+                                    "end_row": min(i + chunk_size, total_rows),
+                                    "error": str(chunk_error)
                                 }
-                            )
-                            # Try to unregister in case of failure
-                            try:
-                                conn.unregister("temp_df")
-                            except:
-                                pass
-
-                if failed_chunks:
-                    self.logger.error(
-                        f"Failed to insert {len(failed_chunks)} chunks out of {(total_rows + chunk_size - 1) // chunk_size}",
-                        extra={
-                            "failed_chunks": len(failed_chunks),
-                            "successful_rows": rows_inserted,
-                            "failed_chunk_details": failed_chunks[:5]  # Log first 5 failures
-                        }
-                    )
-                    return False
+                                self.logger.error(
+                                    f"Failed to insert chunk {chunk_num}: {chunk_error}",
+                                    extra={
+                                        "chunk_number": chunk_num,
+                                        "chunk_start": i,
+                                        "chunk_size": len(chunk),
+                                        "error_type": type(chunk_error).__name__
+                                    }
+                                )
+                                break
+
+                            finally:
+                                try:
+                                    conn.unregister("temp_df")
+                                except Exception:
+                                    pass
+
+                    if failed_chunk is not None:
+                        conn.execute("ROLLBACK")
+                        self.logger.error(
+                            f"Rolled back insertion into {table_name} after chunk "
+                            f"{failed_chunk['chunk_number']} of {total_chunks} failed",
+                            extra={
+                                "table_name": table_name,
+                                "rows_rolled_back": rows_inserted,
+                                "failed_chunk_details": failed_chunk
+                            }
+                        )
+                        return False
+
+                    conn.execute("COMMIT")
+
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
 
                 self.logger.info(
                     f"Successfully inserted {rows_inserted} rows into {table_name}",
                     extra={
                         "table_name": table_name,
                         "rows_inserted": rows_inserted,
-                        "chunks_processed": (total_rows + chunk_size - 1) // chunk_size
+                        "chunks_processed": total_chunks
                     }
                 )
                 return True
@@ -261,6 +277,62 @@ class DatabaseOperations:
             self.db_manager.error_handler.handle_query_error(e, query, params)
             return None
 
+    @with_logging("query_to_arrow")
+    def query_to_arrow(
+        self,
+        query: str,
+        params: Optional[List] = None
+    ) -> Optional[pa.Table]:
+        """
+        Execute a SQL query and return results as an Arrow table.
+
+        Unlike query_to_dataframe(), results are not converted to pandas, which
+        suits aggregate queries whose few values are read directly in Python.
+
+        Args:
+            query: SQL query to execute
+            params: Optional query parameters
+
+        Returns:
+            Arrow table with query results or None if error
+        """
+        query_preview = query[:200] + "..." if len(query) > 200 else query
+
+        self.logger.debug(
+            f"Executing query: {query_preview}",
+            extra={
+                "query_length": len(query),
+                "has_params": params is not None,
+                "param_count": len(params) if params else 0
+            }
+        )
+
+        try:
+            with self.db_manager.get_connection(read_only=True) as conn:
+                with PerformanceLogger(self.logger, "sql_query_execution"):
+                    if params:
+                        result = conn.execute(query, params)
+                    else:
+                        result = conn.execute(query)
+                    # to_arrow_table on newer DuckDB (fetch_arrow_table is deprecated),
+                    # as in python/imputation/helpers.py
+                    to_arrow = getattr(result, 'to_arrow_table', None) or result.fetch_arrow_table
+                    result = to_arrow()
+
+                self.logger.info(
+                    f"Query executed successfully: {result.num_rows} rows returned",
+                    extra={
+                        "rows_returned": result.num_rows,
+                        "columns_returned": result.num_columns,
+                        "memory_usage_mb": result.nbytes / 1024 / 1024
+                    }
+                )
+                return result
+
+        except Exception as e:
+            self.db_manager.error_handler.handle_query_error(e, query, params)
+            return None
+
     @with_logging("get_table_count")
     def get_table_count(self, table_name: str) -> int:
         """
@@ -399,17 +471,18 @@ class DatabaseOperations:
         self,
         df: pd.DataFrame,
         table_name: str,
-        key_columns: List[str],
-        chunk_size: int = 1000
+        key_columns: List[str]
     ) -> bool:
         """
         Upsert (insert or update) data based on key columns.
 
+        Matching rows are deleted and the new rows inserted in one transaction,
+        so a failed insert leaves the existing rows in place.
+
         Args:
             df: DataFrame with data to upsert
             table_name: Target table name
             key_columns: Columns to use for matching existing records
-            chunk_size: Number of rows to process at once
 
         Returns:
             True if successful, False otherwise
@@ -419,6 +492,8 @@ class DatabaseOperations:
             return True
 
         try:
+            table_exists = self.table_exists(table_name)
+
             with self.db_manager.get_connection() as conn:
                 # Create temporary table
                 temp_table = f"temp_{table_name}_{int(datetime.now().timestamp())}"
@@ -426,31 +501,48 @@ class DatabaseOperations:
                 # Register DataFrame as temporary table
                 conn.register(temp_table, df)
 
-                # Build MERGE statement (DuckDB doesn't support MERGE, so use INSERT OR REPLACE)
-                if not self.table_exists(table_name):
-                    # If target table doesn't exist, just insert
-                    conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM {temp_table}")
-                else:
-                    # Delete existing records that match key columns
-                    key_conditions = []
-                    for key_col in key_columns:
-                        key_conditions.append(f"{table_name}.{key_col} = {temp_table}.{key_col}")
-
-                    delete_sql = f"""
-                    DELETE FROM {table_name}
-                    WHERE EXISTS (
-                        SELECT 1 FROM {temp_table}
-                        WHERE {' AND '.join(key_conditions)}
-                    )
-                    """
-                    conn.execute(delete_sql)
-
-                    # Insert all records from temp table
-                    conn.execute(f"INSERT INTO {table_name} SELECT * FROM {temp_table}")
-
-                conn.unregister(temp_table)
-
-                self.logger.info(f"Successfully upserted {len(df)} rows into {table_name}")
+                # DuckDB's INSERT ... ON CONFLICT needs a unique constraint the
+                # target table may not have, so delete matching keys and insert
+                conn.execute("BEGIN TRANSACTION")
+                try:
+                    rows_replaced = 0
+                    if not table_exists:
+                        # If target table doesn't exist, just insert
+                        conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM {temp_table}")
+                    else:
+                        # Delete existing records that match key columns
+                        key_conditions = []
+                        for key_col in key_columns:
+                            key_conditions.append(f"{table_name}.{key_col} = {temp_table}.{key_col}")
+
+                        delete_sql = f"""
+                        DELETE FROM {table_name}
+                        WHERE EXISTS (
+                            SELECT 1 FROM {temp_table}
+                            WHERE {' AND '.join(key_conditions)}
+                        )
+                        """
+                        rows_replaced = conn.execute(delete_sql).fetchone()[0]
+
+                        # Insert all records from temp table
+                        conn.execute(f"INSERT INTO {table_name} SELECT * FROM {temp_table}")
+
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                finally:
+                    conn.unregister(temp_table)
+
+                self.logger.info(
+                    f"Successfully upserted {len(df)} rows into {table_name} "
+                    f"({rows_replaced} replaced, {len(df) - rows_replaced} new)",
+                    extra={
+                        "table_name": table_name,
+                        "rows_upserted": len(df),
+                        "rows_replaced": rows_replaced
+                    }
+                )
                 return True
 
         except Exception as e:
@@ -15,10 +15,14 @@ from .config import (
 )
 from .helpers import (
     get_completed_dataset,
+    get_completed_dataset_arrow,
     get_all_imputations,
+    get_mental_health_imputations_batch,
+    get_all_mental_health_imputations,
     get_imputation_metadata,
     get_imputed_variable_summary,
-    validate_imputations
+    validate_imputations,
+    encode_categoricals
 )
 
 __all__ = [
@@ -28,8 +32,12 @@ __all__ = [
     'get_study_config',
     'get_table_prefix',
     'get_completed_dataset',
+    'get_completed_dataset_arrow',
     'get_all_imputations',
+    'get_mental_health_imputations_batch',
+    'get_all_mental_health_imputations',
     'get_imputation_metadata',
     'get_imputed_variable_summary',
-    'validate_imputations'
+    'validate_imputations',
+    'encode_categoricals'
 ]
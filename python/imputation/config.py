@@ -4,6 +4,8 @@ Configuration loader for imputation pipeline
 Provides a single source of truth for imputation parameters across all scripts.
 """
 
+import copy
+import functools
 import yaml
 from pathlib import Path
 from typing import Dict, Any
@@ -178,6 +180,9 @@ def get_study_config(study_id: str = "ne25") -> Dict[str, Any]:
     """
     Load study-specific imputation configuration
 
+    The parsed YAML is cached per study_id; each call returns a deep copy so
+    callers can modify the result without affecting later calls.
+
     Parameters
     ----------
     study_id : str
@@ -200,6 +205,12 @@ def get_study_config(study_id: str = "ne25") -> Dict[str, Any]:
     >>> print(config['data_dir'])
     data/imputation/ne25
     """
+    return copy.deepcopy(_load_study_config(study_id))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_study_config(study_id: str) -> Dict[str, Any]:
+    """Read and parse the study config YAML (cached per study_id)."""
     project_root = Path(__file__).parent.parent.parent
 
     # Try study-specific config first
@@ -7,15 +7,19 @@ tables with base observed data.
 Available Functions
 -------------------
 - get_completed_dataset(): Get a single imputation with all variables
+- get_completed_dataset_arrow(): Same as above, returned as a pyarrow.Table
 - get_all_imputations(): Get all M imputations in long format
 - get_geography_imputations(): Get geography variables (PUMA, county, census tract)
 - get_sociodem_imputations(): Get sociodemographic variables (7 variables)
 - get_childcare_imputations(): Get childcare variables (4 variables)
 - get_mental_health_imputations(): Get mental health variables (7 variables)
+- get_mental_health_imputations_batch(): Get mental health variables for several imputations
+- get_all_mental_health_imputations(): Get mental health variables for all M imputations
 - get_child_aces_imputations(): Get child ACEs variables (9 variables)
 - get_complete_dataset(): Get ALL 30 imputed variables joined together
 - get_imputation_metadata(): Get metadata about imputed variables
 - get_imputed_variable_summary(): Get summary stats for a variable
+- encode_categoricals(): Convert study_id and other low-cardinality columns to category
 - validate_imputations(): Validate imputation tables
 
 Quick Examples
@@ -33,18 +37,177 @@ Quick Examples
 >>> results = validate_imputations(study_id='ne25')
 """
 
+import duckdb
+import functools
+import hashlib
+import json
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
 from typing import List, Optional
 from python.db.connection import DatabaseManager
 from .config import get_imputation_config, get_n_imputations, get_table_prefix
 
+# Parquet side-files written by get_all_imputations(use_cache=True)
+IMPUTATION_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "imputation" / "cache"
+
+# Adult mental health & parenting variables (all on 0-3 scale except the 0/1 screens)
+MENTAL_HEALTH_VARIABLES = [
+    'phq2_interest', 'phq2_depressed', 'phq2_positive',
+    'gad2_nervous', 'gad2_worry', 'gad2_positive',
+    'q1502'
+]
+
+# Low-cardinality string columns that encode_categoricals() converts to pandas
+# 'category' (integer codes), so equality filters and groupbys compare codes
+# rather than strings
+CATEGORICAL_COLUMNS = (
+    'study_id', 'imputation_method', 'a1_raceG', 'raceG', 'fplcat', 'cc_primary_type'
+)
+
+
+def _nonnull_filter(
+    require_nonnull: Optional[List[str]],
+    variables: List[str],
+    table_prefix: str,
+    imputation_m: int,
+    study_id: str,
+    include_observed: bool
+) -> tuple:
+    """
+    Build a WHERE clause (on base alias "b") keeping only rows whose completed
+    value is non-null for every column in require_nonnull.
+
+    Returns the clause (empty string if nothing to filter) and its parameters.
+    """
+    if not require_nonnull:
+        return "", []
+
+    clauses = []
+    params = []
+    for col in require_nonnull:
+        observed = f'b."{col}" IS NOT NULL'
+        if col in variables:
+            # Stored imputed values are never NULL, so a matching row is enough
+            imputed = (
+                f"EXISTS (SELECT 1 FROM {table_prefix}_{col} i "
+                f"WHERE i.pid = b.pid AND i.record_id = b.record_id "
+                f"AND i.imputation_m = ? AND i.study_id = ?)"
+            )
+            params += [imputation_m, study_id]
+            clauses.append(f"({observed} OR {imputed})" if include_observed else imputed)
+        else:
+            clauses.append(observed)
+
+    return "WHERE " + " AND ".join(clauses), params
+
+
+def _fetch_arrow(result) -> pa.Table:
+    """Materialize a DuckDB result as a pyarrow.Table (to_arrow_table on newer DuckDB)."""
+    to_arrow = getattr(result, 'to_arrow_table', None) or result.fetch_arrow_table
+    return to_arrow()
+
+
+def _fetch_df(result) -> pd.DataFrame:
+    """
+    Convert a DuckDB result to pandas via Arrow.
+
+    split_blocks avoids consolidating columns into 2D blocks and self_destruct
+    releases each Arrow buffer as pandas takes it over, so peak memory stays
+    near one copy of the data. DECIMAL columns are cast to float64 to match
+    the dtypes DuckDB's own .df() produces.
+    """
+    table = _fetch_arrow(result)
+    decimal_fields = [
+        i for i, field in enumerate(table.schema) if pa.types.is_decimal(field.type)
+    ]
+    for i in decimal_fields:
+        table = table.set_column(i, table.field(i).name, table.column(i).cast(pa.float64()))
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def encode_categoricals(df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Convert low-cardinality string columns to pandas 'category' dtype
+
+    Helpers return these columns as plain strings. Call this on a result that
+    is filtered or grouped repeatedly by them, so comparisons use integer
+    codes. Note that categorical columns change some pandas behavior, e.g.
+    groupby() includes unobserved levels unless observed=True.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Data returned by one of the helpers (modified in place)
+    columns : list of str, optional
+        Columns to convert. If None, CATEGORICAL_COLUMNS. Missing and
+        numeric columns are skipped.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The same DataFrame, for chaining
+
+    Examples
+    --------
+    >>> meta = encode_categoricals(get_imputation_metadata())
+    >>> meta[meta['study_id'] == 'ne25']
+    """
+    for col in CATEGORICAL_COLUMNS if columns is None else columns:
+        if col in df.columns and not (
+            pd.api.types.is_numeric_dtype(df[col])
+            or isinstance(df[col].dtype, pd.CategoricalDtype)
+        ):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _base_select_columns(
+    conn,
+    base_table: str,
+    variables: List[str],
+    include_observed: bool,
+    base_columns: Optional[List[str]]
+) -> List[str]:
+    """Resolve which base-table columns to project for a completed dataset."""
+    if not include_observed:
+        return ['pid', 'record_id']
+
+    table_columns = list(conn.table(base_table).columns)
+    if base_columns is None:
+        return table_columns
+
+    available = set(table_columns)
+    select_cols = ['pid', 'record_id']
+    for col in [*variables, *base_columns]:
+        if col in available and col not in select_cols:
+            select_cols.append(col)
+    return select_cols
+
+
+def _merge_imputed(base: pd.DataFrame, imputed: pd.DataFrame, var: str, keys: List[str]) -> pd.DataFrame:
+    """Left-join one imputed variable onto base and coalesce with the observed value."""
+    # Left join: only ambiguous records are in imputed tables
+    base = base.merge(imputed, on=keys, how='left', suffixes=('', '_imputed'))
+
+    # Coalesce: use imputed value if available, else observed
+    if f'{var}_imputed' in base.columns:
+        base[var] = base[f'{var}_imputed'].fillna(base[var])
+        base = base.drop(columns=[f'{var}_imputed'])
+
+    return base
+
 
 def get_completed_dataset(
     imputation_m: int,
     variables: Optional[List[str]] = None,
     base_table: str = "ne25_transformed",
     study_id: str = "ne25",
-    include_observed: bool = True
+    include_observed: bool = True,
+    base_columns: Optional[List[str]] = None,
+    require_nonnull: Optional[List[str]] = None
 ) -> pd.DataFrame:
     """
     Construct a completed dataset for a specific imputation
@@ -54,13 +217,23 @@ def get_completed_dataset(
     imputation_m : int
         Which imputation to retrieve (1 to M)
     variables : list of str, optional
-        Imputed variables to include. If None, includes all available.
+        Imputed variables to include. If None, includes all variables listed
+        in imputation_metadata for the study.
     base_table : str, default "ne25_transformed"
         Base table with observed data
     study_id : str, default "ne25"
         Study identifier for filtering imputations
     include_observed : bool, default True
         Whether to include base observed data
+    base_columns : list of str, optional
+        Extra base-table columns to carry along when include_observed=True.
+        If None, every base column is returned; otherwise the base query is
+        projected to pid, record_id, the observed imputed variables, and
+        these columns only.
+    require_nonnull : list of str, optional
+        Only return records whose completed value is non-null for all of
+        these columns. The predicate is evaluated in DuckDB before any other
+        column is fetched, so dropped records are never loaded.
 
     Returns
     -------
@@ -74,6 +247,9 @@ def get_completed_dataset(
     >>>
     >>> # Get imputation 5 with all imputed variables
     >>> df = get_completed_dataset(5)
+    >>>
+    >>> # Get imputation 1 with only the demographics needed for analysis
+    >>> df = get_completed_dataset(1, variables=['female'], base_columns=['a1_raceG'])
     """
     db = DatabaseManager()
 
@@ -85,55 +261,261 @@ def get_completed_dataset(
             f"imputation_m must be between 1 and {max_m}, got {imputation_m}"
         )
 
-    # Start with base data (if requested)
-    if include_observed:
-        with db.get_connection(read_only=True) as conn:
-            base = conn.execute(f"SELECT * FROM {base_table}").df()
-    else:
-        with db.get_connection(read_only=True) as conn:
-            base = conn.execute(f"SELECT pid, record_id FROM {base_table}").df()
-
     # Get list of available imputed variables
     if variables is None:
-        with db.get_connection(read_only=True) as conn:
-            meta = conn.execute(f"""
-                SELECT variable_name
-                FROM imputation_metadata
-                WHERE study_id = '{study_id}'
-            """).df()
-        variables = meta['variable_name'].tolist()
+        meta = get_imputation_metadata()
+        variables = meta.loc[meta['study_id'] == study_id, 'variable_name'].tolist()
 
     # Get table prefix for study-specific table names
     table_prefix = get_table_prefix(study_id)
 
-    # Join each imputed variable table
-    for var in variables:
-        table_name = f"{table_prefix}_{var}"
-        query = f"""
-            SELECT pid, record_id, {var}
-            FROM {table_name}
-            WHERE imputation_m = {imputation_m}
-              AND study_id = '{study_id}'
-        """
+    # Row filter evaluated against the base table before columns are fetched
+    where_clause, where_params = _nonnull_filter(
+        require_nonnull, variables, table_prefix, imputation_m, study_id, include_observed
+    )
+
+    with db.get_connection(read_only=True) as conn:
+        # Start with base data, projected to the columns actually needed
+        select_cols = _base_select_columns(conn, base_table, variables, include_observed, base_columns)
+        select_list = ", ".join(f'b."{col}"' for col in select_cols)
+        base = _fetch_df(conn.execute(
+            f"SELECT {select_list} FROM {base_table} b {where_clause}", where_params
+        ))
+
+        # Join each imputed variable table
+        for var in variables:
+            table_name = f"{table_prefix}_{var}"
+            query = f"""
+                SELECT pid, record_id, {var}
+                FROM {table_name}
+                WHERE imputation_m = ?
+                  AND study_id = ?
+            """
+            imputed = _fetch_df(conn.execute(query, [imputation_m, study_id]))
+            base = _merge_imputed(base, imputed, var, ['pid', 'record_id'])
+
+    return base
+
+
+def get_completed_dataset_arrow(
+    imputation_m: int,
+    variables: Optional[List[str]] = None,
+    base_table: str = "ne25_transformed",
+    study_id: str = "ne25",
+    include_observed: bool = True,
+    base_columns: Optional[List[str]] = None,
+    require_nonnull: Optional[List[str]] = None
+) -> pa.Table:
+    """
+    Construct a completed dataset for a specific imputation as an Arrow table
+
+    Same result as get_completed_dataset(), but the imputed tables are joined
+    and coalesced inside DuckDB and returned as a pyarrow.Table, so no pandas
+    copy is made until the caller converts (e.g. after pa.concat_tables).
+
+    Parameters
+    ----------
+    imputation_m : int
+        Which imputation to retrieve (1 to M)
+    variables : list of str, optional
+        Imputed variables to include. If None, includes all variables listed
+        in imputation_metadata for the study.
+    base_table : str, default "ne25_transformed"
+        Base table with observed data
+    study_id : str, default "ne25"
+        Study identifier for filtering imputations
+    include_observed : bool, default True
+        Whether to include base observed data
+    base_columns : list of str, optional
+        Extra base-table columns to carry along when include_observed=True
+        (see get_completed_dataset)
+    require_nonnull : list of str, optional
+        Only return records whose completed value is non-null for all of
+        these columns (see get_completed_dataset)
 
-        with db.get_connection(read_only=True) as conn:
-            imputed = conn.execute(query).df()
+    Returns
+    -------
+    pyarrow.Table
+        Completed dataset with observed + imputed values for imputation m
+
+    Examples
+    --------
+    >>> tbl = get_completed_dataset_arrow(1, variables=['female', 'raceG'], base_columns=[])
+    >>> df = tbl.to_pandas()
+    """
+    db = DatabaseManager()
+
+    # Validate imputation_m
+    config = get_imputation_config()
+    max_m = config['n_imputations']
+    if imputation_m < 1 or imputation_m > max_m:
+        raise ValueError(
+            f"imputation_m must be between 1 and {max_m}, got {imputation_m}"
+        )
+
+    # Get list of available imputed variables
+    if variables is None:
+        meta = get_imputation_metadata()
+        variables = meta.loc[meta['study_id'] == study_id, 'variable_name'].tolist()
+
+    # Get table prefix for study-specific table names
+    table_prefix = get_table_prefix(study_id)
+
+    with db.get_connection(read_only=True) as conn:
+        # Base columns to project (observed values are coalesced with imputed ones)
+        base_cols = _base_select_columns(conn, base_table, variables, include_observed, base_columns)
+
+        aliases = {var: f"i{k}" for k, var in enumerate(variables)}
+        select_items = [
+            f'COALESCE({aliases[col]}."{col}", b."{col}") AS "{col}"' if col in aliases
+            else f'b."{col}"'
+            for col in base_cols
+        ]
+        select_items += [
+            f'{alias}."{var}" AS "{var}"'
+            for var, alias in aliases.items() if var not in base_cols
+        ]
 
         # Left join: only ambiguous records are in imputed tables
-        base = base.merge(imputed, on=['pid', 'record_id'], how='left', suffixes=('', '_imputed'))
+        joins = [
+            f"""LEFT JOIN (
+                    SELECT pid, record_id, "{var}"
+                    FROM {table_prefix}_{var}
+                    WHERE imputation_m = ? AND study_id = ?
+                ) {alias} ON b.pid = {alias}.pid AND b.record_id = {alias}.record_id"""
+            for var, alias in aliases.items()
+        ]
+        where_clause, where_params = _nonnull_filter(
+            require_nonnull, variables, table_prefix, imputation_m, study_id, include_observed
+        )
+        query = (
+            f"SELECT {', '.join(select_items)}\n"
+            f"FROM {base_table} b\n" + "\n".join(joins) + f"\n{where_clause}"
+        )
+        params = [imputation_m, study_id] * len(aliases) + where_params
 
-        # Coalesce: use imputed value if available, else observed
-        if f'{var}_imputed' in base.columns:
-            base[var] = base[f'{var}_imputed'].fillna(base[var])
-            base = base.drop(columns=[f'{var}_imputed'])
+        return _fetch_arrow(conn.execute(query, params))
 
-    return base
+
+def _get_imputations_long(
+    variables: Optional[List[str]],
+    m_list: List[int],
+    base_table: str,
+    study_id: str,
+    include_observed: bool,
+    base_columns: Optional[List[str]]
+) -> pd.DataFrame:
+    """
+    Build completed datasets for several imputations in long format.
+
+    The observed base data does not depend on m, so it is read once and
+    replicated per imputation; each imputed table is read once for all
+    requested imputations and merged on (pid, record_id, imputation_m).
+    """
+    db = DatabaseManager()
+
+    # Validate imputation numbers
+    config = get_imputation_config()
+    max_m = config['n_imputations']
+    m_list = list(m_list)
+    bad_m = [m for m in m_list if m < 1 or m > max_m]
+    if bad_m or not m_list:
+        raise ValueError(
+            f"imputation numbers must be between 1 and {max_m}, got {m_list}"
+        )
+
+    # Get list of available imputed variables
+    if variables is None:
+        meta = get_imputation_metadata()
+        variables = meta.loc[meta['study_id'] == study_id, 'variable_name'].tolist()
+
+    # Get table prefix for study-specific table names
+    table_prefix = get_table_prefix(study_id)
+    m_placeholders = ", ".join("?" for _ in m_list)
+
+    with db.get_connection(read_only=True) as conn:
+        # Observed base data: one read, replicated once per imputation
+        select_cols = _base_select_columns(conn, base_table, variables, include_observed, base_columns)
+        select_list = ", ".join(f'"{col}"' for col in select_cols)
+        base = _fetch_df(conn.execute(f"SELECT {select_list} FROM {base_table}"))
+
+        n_base = len(base)
+        long = base.iloc[np.tile(np.arange(n_base), len(m_list))].reset_index(drop=True)
+        long['imputation_m'] = np.repeat(m_list, n_base)
+
+        # Join each imputed variable table (all requested imputations at once)
+        for var in variables:
+            table_name = f"{table_prefix}_{var}"
+            query = f"""
+                SELECT pid, record_id, imputation_m, {var}
+                FROM {table_name}
+                WHERE study_id = ?
+                  AND imputation_m IN ({m_placeholders})
+            """
+            imputed = _fetch_df(conn.execute(query, [study_id, *m_list]))
+            imputed['imputation_m'] = imputed['imputation_m'].astype(long['imputation_m'].dtype)
+            long = _merge_imputed(long, imputed, var, ['pid', 'record_id', 'imputation_m'])
+
+    # Keep imputation_m as the last column, matching get_completed_dataset + m
+    long = long[[c for c in long.columns if c != 'imputation_m'] + ['imputation_m']]
+    return long
+
+
+def _imputations_cache_path(
+    variables: List[str],
+    base_table: str,
+    study_id: str,
+    include_observed: bool,
+    base_columns: Optional[List[str]]
+) -> Path:
+    """
+    Content-addressed Parquet path for a get_all_imputations() request.
+
+    The key includes the latest imputation_metadata.created_date for the
+    requested variables (re-read from the database, not the in-process
+    metadata cache) and a fingerprint of the base table (row count plus a
+    hash of its column names and types). Re-running the imputation pipeline
+    or rebuilding the base table therefore produces a new key and stale
+    files are ignored.
+    """
+    meta = get_imputation_metadata(refresh=True)
+    study_meta = meta[(meta['study_id'] == study_id) & meta['variable_name'].isin(variables)]
+    if 'created_date' in study_meta.columns and len(study_meta) > 0:
+        version = str(study_meta['created_date'].max())
+    else:
+        version = None
+
+    db = DatabaseManager()
+    with db.get_connection(read_only=True) as conn:
+        n_rows = conn.execute(f"SELECT COUNT(*) FROM {base_table}").fetchone()[0]
+        schema = conn.execute(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_name = ? ORDER BY ordinal_position",
+            [base_table]
+        ).fetchall()
+    schema_hash = hashlib.sha256(json.dumps(schema).encode('utf-8')).hexdigest()[:16]
+
+    key = json.dumps({
+        'study_id': study_id,
+        'variables': sorted(variables),
+        'base_table': base_table,
+        'include_observed': include_observed,
+        'base_columns': None if base_columns is None else sorted(base_columns),
+        'version': version,
+        'base_rows': n_rows,
+        'base_schema': schema_hash
+    }, sort_keys=True)
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+    return IMPUTATION_CACHE_DIR / f"{study_id}_{digest}.parquet"
 
 
 def get_all_imputations(
     variables: Optional[List[str]] = None,
     base_table: str = "ne25_transformed",
-    study_id: str = "ne25"
+    study_id: str = "ne25",
+    include_observed: bool = True,
+    base_columns: Optional[List[str]] = None,
+    use_cache: bool = False
 ) -> pd.DataFrame:
     """
     Get all imputations for specified variables in long format
@@ -146,6 +528,16 @@ def get_all_imputations(
         Base table with observed data
     study_id : str, default "ne25"
         Study identifier for filtering imputations
+    include_observed : bool, default True
+        Whether to include base observed data
+    base_columns : list of str, optional
+        Extra base-table columns to include (see get_completed_dataset)
+    use_cache : bool, default False
+        If True, read/write a Parquet copy of the result under
+        data/imputation/cache/. The cache key includes the variables'
+        metadata created_date and the base table's row count and schema,
+        so it is invalidated when imputations are re-inserted or the base
+        table is rebuilt.
 
     Returns
     -------
@@ -159,18 +551,46 @@ def get_all_imputations(
     >>>
     >>> # Analyze across imputations
     >>> df_long.groupby('imputation_m')['puma'].value_counts()
+    >>>
+    >>> # Reuse a local Parquet copy on subsequent runs
+    >>> df_long = get_all_imputations(variables=['puma'], use_cache=True)
     """
-    config = get_imputation_config()
-    max_m = config['n_imputations']
+    max_m = get_n_imputations()
 
-    # Stack all imputations
-    all_imputations = []
-    for m in range(1, max_m + 1):
-        df_m = get_completed_dataset(m, variables=variables, base_table=base_table, study_id=study_id)
-        df_m['imputation_m'] = m
-        all_imputations.append(df_m)
+    if use_cache:
+        if variables is None:
+            meta = get_imputation_metadata()
+            variables = meta.loc[meta['study_id'] == study_id, 'variable_name'].tolist()
 
-    return pd.concat(all_imputations, ignore_index=True)
+        cache_path = _imputations_cache_path(
+            variables, base_table, study_id, include_observed, base_columns
+        )
+        if cache_path.exists():
+            return pq.read_table(cache_path).to_pandas()
+
+    df_long = _get_imputations_long(
+        variables,
+        range(1, max_m + 1),
+        base_table=base_table,
+        study_id=study_id,
+        include_observed=include_observed,
+        base_columns=base_columns
+    )
+
+    if use_cache:
+        # Dictionary + RLE encoding suits highly repetitive columns (e.g. puma across M)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.parquet.tmp')
+        pq.write_table(
+            pa.Table.from_pandas(df_long, preserve_index=False),
+            tmp_path,
+            compression='zstd',
+            use_dictionary=True,
+            data_page_size=1 << 20
+        )
+        tmp_path.replace(cache_path)
+
+    return df_long
 
 
 def get_geography_imputations(
@@ -296,7 +716,8 @@ def get_childcare_imputations(
 def get_mental_health_imputations(
     study_id: str = "ne25",
     imputation_number: int = 1,
-    include_base_data: bool = False
+    include_base_data: bool = False,
+    require_nonnull: Optional[List[str]] = None
 ) -> pd.DataFrame:
     """
     Get adult mental health and parenting imputations for a specific imputation
@@ -309,6 +730,9 @@ def get_mental_health_imputations(
         Which imputation to retrieve (1 to M)
     include_base_data : bool, default False
         If True, merge with ne25_transformed base data
+    require_nonnull : list of str, optional
+        Only return records with non-null values for these columns, e.g.
+        ['phq2_interest'] to keep respondents with mental health data
 
     Returns
     -------
@@ -345,17 +769,105 @@ def get_mental_health_imputations(
     >>> # Analyze PHQ-2+ by race/ethnicity
     >>> mh_full.groupby('a1_raceG')['phq2_positive'].value_counts(normalize=True)
     """
-    mental_health_vars = [
-        'phq2_interest', 'phq2_depressed', 'phq2_positive',
-        'gad2_nervous', 'gad2_worry', 'gad2_positive',
-        'q1502'
-    ]
     return get_completed_dataset(
         imputation_m=imputation_number,
-        variables=mental_health_vars,
+        variables=MENTAL_HEALTH_VARIABLES,
         base_table=f"{study_id}_transformed",
         study_id=study_id,
-        include_observed=include_base_data
+        include_observed=include_base_data,
+        require_nonnull=require_nonnull
+    )
+
+
+def get_mental_health_imputations_batch(
+    study_id: str = "ne25",
+    m_list: Optional[List[int]] = None,
+    include_base_data: bool = True,
+    base_columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Get mental health variables for several imputations in one pass
+
+    The observed base data is read once and each imputed table is read once
+    for all of m_list, instead of once per imputation as with repeated
+    get_mental_health_imputations() calls.
+
+    Parameters
+    ----------
+    study_id : str, default "ne25"
+        Study identifier
+    m_list : list of int, optional
+        Imputation numbers to retrieve. If None, all M imputations.
+    include_base_data : bool, default True
+        If True, merge with the study's transformed base data
+    base_columns : list of str, optional
+        Extra base-table columns to carry along when include_base_data=True.
+        If None, every base column is returned (see get_completed_dataset);
+        pass [] to keep only the mental health variables.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Long-format mental health variables with pid, record_id, imputation_m.
+        Use ``df.groupby('imputation_m')`` to split by imputation.
+
+    Examples
+    --------
+    >>> mh = get_mental_health_imputations_batch(study_id='ne25', m_list=[1, 2, 3])
+    >>> mh.groupby('imputation_m')['gad2_positive'].mean()
+    """
+    if m_list is None:
+        m_list = range(1, get_n_imputations() + 1)
+
+    return _get_imputations_long(
+        MENTAL_HEALTH_VARIABLES,
+        m_list,
+        base_table=f"{study_id}_transformed",
+        study_id=study_id,
+        include_observed=include_base_data,
+        base_columns=base_columns
+    )
+
+
+def get_all_mental_health_imputations(
+    study_id: str = "ne25",
+    include_base_data: bool = False,
+    base_columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Get adult mental health and parenting variables for all M imputations
+
+    Long-format counterpart of get_mental_health_imputations(), intended for
+    pooling estimates across imputations with a single groupby instead of a
+    Python loop over imputation numbers.
+
+    Parameters
+    ----------
+    study_id : str, default "ne25"
+        Study identifier
+    include_base_data : bool, default False
+        If True, merge with the study's transformed base data
+    base_columns : list of str, optional
+        Extra base-table columns to include (see
+        get_mental_health_imputations_batch)
+
+    Returns
+    -------
+    pandas.DataFrame
+        Mental health variables with pid, record_id, imputation_m
+
+    Examples
+    --------
+    >>> mh_long = get_all_mental_health_imputations(
+    ...     study_id='ne25', include_base_data=True, base_columns=[]
+    ... )
+    >>> mh_long = mh_long[mh_long['phq2_interest'].notna()]
+    >>> mh_long.groupby('imputation_m')['phq2_positive'].mean()
+    """
+    return get_mental_health_imputations_batch(
+        study_id=study_id,
+        include_base_data=include_base_data,
+        base_columns=base_columns
     )
 
 
@@ -437,7 +949,8 @@ def get_complete_dataset(
     imputation_number: int = 1,
     include_base_data: bool = False,
     include_mental_health: bool = True,
-    include_child_aces: bool = True
+    include_child_aces: bool = True,
+    require_nonnull: Optional[List[str]] = None
 ) -> pd.DataFrame:
     """
     Get complete dataset with ALL imputed variables joined together
@@ -464,6 +977,8 @@ def get_complete_dataset(
         If True, includes mental health and parenting variables
     include_child_aces : bool, default True
         If True, includes child ACEs variables
+    require_nonnull : list of str, optional
+        Only return records with non-null values for these columns
 
     Returns
     -------
@@ -537,14 +1052,33 @@ def get_complete_dataset(
         variables=all_imputed_vars,
         base_table=f"{study_id}_transformed",
         study_id=study_id,
-        include_observed=include_base_data
+        include_observed=include_base_data,
+        require_nonnull=require_nonnull
     )
 
 
-def get_imputation_metadata() -> pd.DataFrame:
+@functools.lru_cache(maxsize=8)
+def _load_imputation_metadata(db_path: str) -> pd.DataFrame:
+    """Query imputation_metadata once per database path (cached per process)."""
+    with duckdb.connect(db_path, read_only=True) as conn:
+        metadata = _fetch_df(conn.execute("SELECT * FROM imputation_metadata"))
+
+    return metadata
+
+
+def get_imputation_metadata(refresh: bool = False) -> pd.DataFrame:
     """
     Get metadata about all imputed variables
 
+    The metadata table is small and only changes when the imputation pipeline
+    runs, so the query result is cached in-process. Each call returns a copy,
+    so callers can filter or modify it freely.
+
+    Parameters
+    ----------
+    refresh : bool, default False
+        If True, discard the cached result and re-query the database
+
     Returns
     -------
     pandas.DataFrame
@@ -555,12 +1089,11 @@ def get_imputation_metadata() -> pd.DataFrame:
     >>> meta = get_imputation_metadata()
     >>> print(meta[['variable_name', 'n_imputations', 'imputation_method']])
     """
-    db = DatabaseManager()
+    if refresh:
+        _load_imputation_metadata.cache_clear()
 
-    with db.get_connection(read_only=True) as conn:
-        metadata = conn.execute("SELECT * FROM imputation_metadata").df()
-
-    return metadata
+    db_path = DatabaseManager().database_path
+    return _load_imputation_metadata(db_path).copy()
 
 
 def get_imputed_variable_summary(variable_name: str, study_id: str = "ne25") -> pd.DataFrame:
@@ -619,6 +1152,105 @@ def get_imputed_variable_summary(variable_name: str, study_id: str = "ne25") ->
     return summary
 
 
+# Value checks used by validate_imputations: variable -> (SQL predicate
+# matching invalid stored values, issue message suffix)
+_CC_PRIMARY_TYPES = [
+    'Relative care',
+    'Non-relative care',
+    'Childcare center',
+    'Preschool program',
+    'Head Start/Early Head Start',
+    'Other'
+]
+_BINARY_RULE = ("{var} NOT IN (0, 1)", "invalid values (must be 0 or 1)")
+
+_VALIDATION_RULES = {
+    # Childcare
+    'cc_receives_care': (
+        "{var} NOT IN ('Yes', 'No')", "invalid values (must be 'Yes' or 'No')"
+    ),
+    'cc_primary_type': (
+        "{var} NOT IN (" + ", ".join(f"'{t}'" for t in _CC_PRIMARY_TYPES) + ")",
+        f"invalid values (must be one of: {', '.join(_CC_PRIMARY_TYPES)})"
+    ),
+    'cc_hours_per_week': (
+        "({var} < 0 OR {var} > 168)", "values outside valid range (0-168 hours/week)"
+    ),
+    'childcare_10hrs_nonfamily': _BINARY_RULE,
+    # Mental health items (PHQ-2 and GAD-2, 0-3) and positive screens (0/1)
+    **{
+        var: ("({var} < 0 OR {var} > 3)", "values outside valid range (0-3)")
+        for var in ['phq2_interest', 'phq2_depressed', 'gad2_nervous', 'gad2_worry', 'q1502']
+    },
+    'phq2_positive': _BINARY_RULE,
+    'gad2_positive': _BINARY_RULE,
+    # Child ACE items (0/1) and total (0-8)
+    **{
+        var: _BINARY_RULE
+        for var in ['child_ace_parent_divorce', 'child_ace_parent_death', 'child_ace_parent_jail',
+                    'child_ace_domestic_violence', 'child_ace_neighborhood_violence',
+                    'child_ace_mental_illness', 'child_ace_substance_use', 'child_ace_discrimination']
+    },
+    'child_ace_total': ("({var} < 0 OR {var} > 8)", "values outside valid range (0-8)"),
+}
+
+# Positive screens are derived as item1 + item2 >= 3
+_POSITIVE_SCREEN_ITEMS = {
+    'phq2_positive': ('phq2_interest', 'phq2_depressed'),
+    'gad2_positive': ('gad2_nervous', 'gad2_worry'),
+}
+
+
+def _validation_branch(k: int, var: str, table_prefix: str) -> str:
+    """
+    Build the UNION ALL branch of validate_imputations for one variable.
+
+    Produces a single aggregate row (k, variable_name, n_imputations, n_null,
+    n_invalid, n_inconsistent, n_duplicate); study_id is bound as $1.
+    """
+    table_name = f"{table_prefix}_{var}"
+
+    rule = _VALIDATION_RULES.get(var)
+    invalid = f"COUNT(*) FILTER (WHERE {rule[0].format(var=var)})" if rule else "0"
+
+    inconsistent = "0"
+    if var in _POSITIVE_SCREEN_ITEMS:
+        item1, item2 = _POSITIVE_SCREEN_ITEMS[var]
+        inconsistent = f"""(
+                SELECT COUNT(*)
+                FROM {table_prefix}_{item1} a
+                JOIN {table_prefix}_{item2} b
+                  ON a.pid = b.pid AND a.record_id = b.record_id AND a.imputation_m = b.imputation_m
+                JOIN {table_name} p
+                  ON a.pid = p.pid AND a.record_id = p.record_id AND a.imputation_m = p.imputation_m
+                WHERE a.study_id = $1
+                  AND ((a.{item1} + b.{item2} >= 3 AND p.{var} = 0)
+                    OR (a.{item1} + b.{item2} < 3 AND p.{var} = 1))
+            )"""
+
+    return f"""
+        SELECT
+            {k} AS k,
+            '{var}' AS variable_name,
+            COUNT(DISTINCT imputation_m) AS n_imputations,
+            COUNT(*) FILTER (WHERE {var} IS NULL) AS n_null,
+            {invalid} AS n_invalid,
+            {inconsistent} AS n_inconsistent,
+            (
+                SELECT COUNT(*)
+                FROM (
+                    SELECT 1
+                    FROM {table_name}
+                    WHERE study_id = $1
+                    GROUP BY pid, record_id, imputation_m
+                    HAVING COUNT(*) > 1
+                ) duplicates
+            ) AS n_duplicate
+        FROM {table_name}
+        WHERE study_id = $1
+    """
+
+
 def validate_imputations(study_id: str = "ne25") -> dict:
     """
     Validate imputation tables for completeness and consistency
@@ -649,230 +1281,60 @@ def validate_imputations(study_id: str = "ne25") -> dict:
     # Get table prefix for study-specific table names
     table_prefix = get_table_prefix(study_id)
 
-    # Get list of imputed variables for this study
     with db.get_connection(read_only=True) as conn:
-        meta = conn.execute(f"""
+        # Get list of imputed variables for this study
+        meta = _fetch_df(conn.execute("""
             SELECT variable_name
             FROM imputation_metadata
-            WHERE study_id = '{study_id}'
-        """).df()
-    variables = meta['variable_name'].tolist()
-
-    for var in variables:
-        table_name = f"{table_prefix}_{var}"
-        with db.get_connection(read_only=True) as conn:
-            # Check number of imputations
-            m_count = conn.execute(f"""
-                SELECT COUNT(DISTINCT imputation_m) as count
-                FROM {table_name}
-                WHERE study_id = '{study_id}'
-            """).df()
-
-            actual_m = m_count['count'].iloc[0]
-            if actual_m != expected_m:
-                issues.append(
-                    f"{var}: Expected {expected_m} imputations, found {actual_m}"
-                )
-
-            # Check for NULL values (should be 0 - NULLs are filtered before saving)
-            # Space-efficient design: only complete imputed/derived values are stored
-            # Records without complete auxiliary variables are excluded from tables
-            null_check = conn.execute(f"""
-                SELECT COUNT(*) as count
-                FROM {table_name}
-                WHERE study_id = '{study_id}' AND {var} IS NULL
-            """).df()
-
-            null_count = null_check['count'].iloc[0]
-            if null_count > 0:
-                issues.append(
-                    f"{var}: Found {null_count} NULL values (should be 0 - NULLs filtered before save)"
-                )
-
-            # Childcare-specific validation
-            if var == 'cc_receives_care':
-                # Check for valid values (should be "Yes" or "No")
-                valid_check = conn.execute(f"""
-                    SELECT COUNT(*) as count
-                    FROM {table_name}
-                    WHERE study_id = '{study_id}'
-                      AND {var} NOT IN ('Yes', 'No')
-                """).df()
-                invalid_count = valid_check['count'].iloc[0]
-                if invalid_count > 0:
-                    issues.append(
-                        f"{var}: Found {invalid_count} invalid values (must be 'Yes' or 'No')"
-                    )
-
-            elif var == 'cc_primary_type':
-                # Check for valid childcare types (from NE25 codebook)
-                valid_types = [
-                    'Relative care',
-                    'Non-relative care',
-                    'Childcare center',
-                    'Preschool program',
-                    'Head Start/Early Head Start',
-                    'Other'
-                ]
-                valid_list = "', '".join(valid_types)
-                valid_check = conn.execute(f"""
-                    SELECT COUNT(*) as count
-                    FROM {table_name}
-                    WHERE study_id = '{study_id}'
-                      AND {var} NOT IN ('{valid_list}')
-                """).df()
-                invalid_count = valid_check['count'].iloc[0]
-                if invalid_count > 0:
-                    issues.append(
-                        f"{var}: Found {invalid_count} invalid values (must be one of: {', '.join(valid_types)})"
-                    )
-
-            elif var == 'cc_hours_per_week':
-                # Check for reasonable hour ranges (0-168 hours per week)
-                range_check = conn.execute(f"""
-                    SELECT COUNT(*) as count
-                    FROM {table_name}
-                    WHERE study_id = '{study_id}'
-                      AND ({var} < 0 OR {var} > 168)
-                """).df()
-                invalid_count = range_check['count'].iloc[0]
-                if invalid_count > 0:
-                    issues.append(
-                        f"{var}: Found {invalid_count} values outside valid range (0-168 hours/week)"
-                    )
-
-            elif var == 'childcare_10hrs_nonfamily':
-                # Check for valid boolean values (0 or 1)
-                bool_check = conn.execute(f"""
-                    SELECT COUNT(*) as count
-                    FROM {table_name}
-                    WHERE study_id = '{study_id}'
-                      AND {var} NOT IN (0, 1)
-                """).df()
-                invalid_count = bool_check['count'].iloc[0]
-                if invalid_count > 0:
-                    issues.append(
-                        f"{var}: Found {invalid_count} invalid values (must be 0 or 1)"
-                    )
-
-            # Mental health item validation (PHQ-2 and GAD-2 items)
-            elif var in ['phq2_interest', 'phq2_depressed', 'gad2_nervous', 'gad2_worry', 'q1502']:
-                # Check for valid range (0-3)
-                range_check = conn.execute(f"""
-                    SELECT COUNT(*) as count
-                    FROM {table_name}
-                    WHERE study_id = '{study_id}'
-                      AND ({var} < 0 OR {var} > 3)
-                """).df()
-                invalid_count = range_check['count'].iloc[0]
-                if invalid_count > 0:
-                    issues.append(
-                        f"{var}: Found {invalid_count} values outside valid range (0-3)"
-                    )
-
-            # Mental health positive screen validation
-            elif var in ['phq2_positive', 'gad2_positive']:
-                # Check for valid boolean values
-                bool_check = conn.execute(f"""
-                    SELECT COUNT(*) as count
-                    FROM {table_name}
-                    WHERE study_id = '{study_id}'
-                      AND {var} NOT IN (0, 1)
-                """).df()
-                invalid_count = bool_check['count'].iloc[0]
-                if invalid_count > 0:
-                    issues.append(
-                        f"{var}: Found {invalid_count} invalid values (must be 0 or 1)"
-                    )
-
-                # Verify positive screen derivation consistency (check sample)
-                if var == 'phq2_positive':
-                    # PHQ-2+ should be TRUE when phq2_interest + phq2_depressed >= 3
-                    consistency_check = conn.execute(f"""
-                        SELECT COUNT(*) as count
-                        FROM {table_prefix}_phq2_interest i
-                        JOIN {table_prefix}_phq2_depressed d
-                          ON i.pid = d.pid AND i.record_id = d.record_id AND i.imputation_m = d.imputation_m
-                        JOIN {table_name} p
-                          ON i.pid = p.pid AND i.record_id = p.record_id AND i.imputation_m = p.imputation_m
-                        WHERE i.study_id = '{study_id}'
-                          AND ((i.phq2_interest + d.phq2_depressed >= 3 AND p.phq2_positive = 0)
-                            OR (i.phq2_interest + d.phq2_depressed < 3 AND p.phq2_positive = 1))
-                    """).df()
-                    inconsistent_count = consistency_check['count'].iloc[0]
-                    if inconsistent_count > 0:
-                        issues.append(
-                            f"{var}: Found {inconsistent_count} inconsistent positive screen derivations"
-                        )
-
-                elif var == 'gad2_positive':
-                    # GAD-2+ should be TRUE when gad2_nervous + gad2_worry >= 3
-                    consistency_check = conn.execute(f"""
-                        SELECT COUNT(*) as count
-                        FROM {table_prefix}_gad2_nervous n
-                        JOIN {table_prefix}_gad2_worry w
-                          ON n.pid = w.pid AND n.record_id = w.record_id AND n.imputation_m = w.imputation_m
-                        JOIN {table_name} g
-                          ON n.pid = g.pid AND n.record_id = g.record_id AND n.imputation_m = g.imputation_m
-                        WHERE n.study_id = '{study_id}'
-                          AND ((n.gad2_nervous + w.gad2_worry >= 3 AND g.gad2_positive = 0)
-                            OR (n.gad2_nervous + w.gad2_worry < 3 AND g.gad2_positive = 1))
-                    """).df()
-                    inconsistent_count = consistency_check['count'].iloc[0]
-                    if inconsistent_count > 0:
-                        issues.append(
-                            f"{var}: Found {inconsistent_count} inconsistent positive screen derivations"
-                        )
-
-            # Child ACE item validation (binary 0/1)
-            elif var in ['child_ace_parent_divorce', 'child_ace_parent_death', 'child_ace_parent_jail',
-                         'child_ace_domestic_violence', 'child_ace_neighborhood_violence',
-                         'child_ace_mental_illness', 'child_ace_substance_use', 'child_ace_discrimination']:
-                # Check for valid boolean values (0 or 1)
-                bool_check = conn.execute(f"""
-                    SELECT COUNT(*) as count
-                    FROM {table_name}
-                    WHERE study_id = '{study_id}'
-                      AND {var} NOT IN (0, 1)
-                """).df()
-                invalid_count = bool_check['count'].iloc[0]
-                if invalid_count > 0:
-                    issues.append(
-                        f"{var}: Found {invalid_count} invalid values (must be 0 or 1)"
-                    )
-
-            # Child ACE total validation (0-8 scale)
-            elif var == 'child_ace_total':
-                # Check for valid range (0-8)
-                range_check = conn.execute(f"""
-                    SELECT COUNT(*) as count
-                    FROM {table_name}
-                    WHERE study_id = '{study_id}'
-                      AND ({var} < 0 OR {var} > 8)
-                """).df()
-                invalid_count = range_check['count'].iloc[0]
-                if invalid_count > 0:
-                    issues.append(
-                        f"{var}: Found {invalid_count} values outside valid range (0-8)"
-                    )
-
-            # Check for duplicates (pid, record_id, imputation_m should be unique)
-            dup_check = conn.execute(f"""
-                SELECT COUNT(*) as dup_count
-                FROM (
-                    SELECT pid, record_id, imputation_m, COUNT(*) as n
-                    FROM {table_name}
-                    WHERE study_id = '{study_id}'
-                    GROUP BY pid, record_id, imputation_m
-                    HAVING COUNT(*) > 1
-                ) duplicates
-            """).df()
+            WHERE study_id = ?
+        """, [study_id]))
+        variables = meta['variable_name'].tolist()
 
-            dup_count = dup_check['dup_count'].iloc[0]
-            if dup_count > 0:
-                issues.append(
-                    f"{var}: Found {dup_count} duplicate (pid, record_id, imputation_m) combinations"
-                )
+        # All checks for all variables in one statement: one aggregate row per
+        # variable, so every table is scanned once and DuckDB runs the
+        # branches in parallel instead of one round-trip per check
+        checks = pd.DataFrame()
+        if variables:
+            branches = [
+                _validation_branch(k, var, table_prefix) for k, var in enumerate(variables)
+            ]
+            checks = _fetch_df(conn.execute(
+                "\nUNION ALL\n".join(branches) + "\nORDER BY k", [study_id]
+            ))
+
+    for row in checks.itertuples(index=False):
+        var = row.variable_name
+
+        # Check number of imputations
+        if row.n_imputations != expected_m:
+            issues.append(
+                f"{var}: Expected {expected_m} imputations, found {row.n_imputations}"
+            )
+
+        # Check for NULL values (should be 0 - NULLs are filtered before saving)
+        # Space-efficient design: only complete imputed/derived values are stored
+        # Records without complete auxiliary variables are excluded from tables
+        if row.n_null > 0:
+            issues.append(
+                f"{var}: Found {row.n_null} NULL values (should be 0 - NULLs filtered before save)"
+            )
+
+        # Variable-specific value checks
+        rule = _VALIDATION_RULES.get(var)
+        if rule is not None and row.n_invalid > 0:
+            issues.append(f"{var}: Found {row.n_invalid} {rule[1]}")
+
+        # Positive screen derivation consistency
+        if row.n_inconsistent > 0:
+            issues.append(
+                f"{var}: Found {row.n_inconsistent} inconsistent positive screen derivations"
+            )
+
+        # Check for duplicates (pid, record_id, imputation_m should be unique)
+        if row.n_duplicate > 0:
+            issues.append(
+                f"{var}: Found {row.n_duplicate} duplicate (pid, record_id, imputation_m) combinations"
+            )
 
     return {
         'all_valid': len(issues) == 0,
@@ -2,7 +2,9 @@
 ACS Batch State Runner
 
 Run the complete ACS pipeline for multiple states in sequence, with aggregated
-reporting and error handling.
+reporting and error handling. The IPUMS extracts for all states are requested
+concurrently up front, so each state's extraction step reads its extract from
+the cache instead of waiting for IPUMS in turn.
 
 Usage:
     # Run for Nebraska, Iowa, Kansas
@@ -39,6 +41,12 @@ from datetime import datetime
 from typing import List, Dict, Any
 import structlog
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from python.acs.config_manager import get_state_config
+from python.acs.extract_manager import get_or_submit_extracts
+
 # Configure structured logging
 log = structlog.get_logger()
 
@@ -136,6 +144,34 @@ Examples:
     return parser.parse_args()
 
 
+def prefetch_extracts(states: List[str], year_range: str) -> bool:
+    """Retrieve or submit the IPUMS extracts for all states concurrently.
+
+    Extracts are cached as they complete, so the per-state extraction step
+    that follows finds them in the cache. This is best effort: on failure the
+    extraction step submits any missing extract for its state as before.
+
+    Args:
+        states: State names
+        year_range: Year range
+
+    Returns:
+        True if every extract is now cached, False otherwise
+    """
+    log.info("Prefetching extracts", states=states, year_range=year_range)
+
+    try:
+        configs = [get_state_config(state, year_range, validate=True) for state in states]
+        results = get_or_submit_extracts(configs)
+    except Exception as e:
+        log.warning("Extract prefetch failed, extracting states one at a time", error=str(e))
+        return False
+
+    for state, (extract_id, _, from_cache) in zip(states, results):
+        log.info("Extract ready", state=state, extract_id=extract_id, from_cache=from_cache)
+    return True
+
+
 def run_extraction(state: str, year_range: str, verbose: bool = False) -> Dict[str, Any]:
     """Run Python extraction step for a state.
 
@@ -499,6 +535,11 @@ def main():
     print(f"Year Range: {args.year_range}")
     print()
 
+    # Request all extracts at once; IPUMS processes them in parallel
+    if not args.summary_only and not args.skip_extraction:
+        prefetch_extracts(args.states, args.year_range)
+        print()
+
     # Process each state
     all_results = []
 
@@ -109,14 +109,14 @@ def create_mental_health_tables(db: DatabaseManager, study_id: str):
     table_prefix = get_table_prefix(study_id)
 
     with db.get_connection() as conn:
-        # PHQ-2 Items (0-3 scale, DOUBLE for numeric storage)
+        # PHQ-2 Items (0-3 scale, TINYINT storage)
         conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {table_prefix}_phq2_interest (
                 study_id VARCHAR NOT NULL,
                 pid INTEGER NOT NULL,
                 record_id INTEGER NOT NULL,
                 imputation_m INTEGER NOT NULL,
-                phq2_interest DOUBLE NOT NULL,
+                phq2_interest TINYINT NOT NULL,
                 PRIMARY KEY (study_id, pid, record_id, imputation_m)
             )
         """)
@@ -127,19 +127,19 @@ def create_mental_health_tables(db: DatabaseManager, study_id: str):
                 pid INTEGER NOT NULL,
                 record_id INTEGER NOT NULL,
                 imputation_m INTEGER NOT NULL,
-                phq2_depressed DOUBLE NOT NULL,
+                phq2_depressed TINYINT NOT NULL,
                 PRIMARY KEY (study_id, pid, record_id, imputation_m)
             )
         """)
 
-        # GAD-2 Items (0-3 scale, DOUBLE for numeric storage)
+        # GAD-2 Items (0-3 scale, TINYINT storage)
         conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {table_prefix}_gad2_nervous (
                 study_id VARCHAR NOT NULL,
                 pid INTEGER NOT NULL,
                 record_id INTEGER NOT NULL,
                 imputation_m INTEGER NOT NULL,
-                gad2_nervous DOUBLE NOT NULL,
+                gad2_nervous TINYINT NOT NULL,
                 PRIMARY KEY (study_id, pid, record_id, imputation_m)
             )
         """)
@@ -150,19 +150,19 @@ def create_mental_health_tables(db: DatabaseManager, study_id: str):
                 pid INTEGER NOT NULL,
                 record_id INTEGER NOT NULL,
                 imputation_m INTEGER NOT NULL,
-                gad2_worry DOUBLE NOT NULL,
+                gad2_worry TINYINT NOT NULL,
                 PRIMARY KEY (study_id, pid, record_id, imputation_m)
             )
         """)
 
-        # Parenting Self-Efficacy (0-3 scale, DOUBLE for numeric storage)
+        # Parenting Self-Efficacy (0-3 scale, TINYINT storage)
         conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {table_prefix}_q1502 (
                 study_id VARCHAR NOT NULL,
                 pid INTEGER NOT NULL,
                 record_id INTEGER NOT NULL,
                 imputation_m INTEGER NOT NULL,
-                q1502 DOUBLE NOT NULL,
+                q1502 TINYINT NOT NULL,
                 PRIMARY KEY (study_id, pid, record_id, imputation_m)
             )
         """)
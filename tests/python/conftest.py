@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the Python pipeline tests.
+
+Tests run against a throwaway DuckDB file selected through KIDSIGHTS_DB_PATH,
+so the project database is never touched.
+"""
+
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "python"))
+sys.path.insert(0, str(PROJECT_ROOT / "pipelines" / "python"))
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Path to an empty DuckDB database used in place of the project database."""
+    path = tmp_path / "test.duckdb"
+    duckdb.connect(str(path)).close()
+    monkeypatch.setenv("KIDSIGHTS_DB_PATH", str(path))
+    monkeypatch.chdir(PROJECT_ROOT)
+    return path
+
+
+@pytest.fixture
+def db_ops(db_path):
+    """DatabaseOperations bound to the temporary database."""
+    from db import DatabaseManager, DatabaseOperations
+    return DatabaseOperations(DatabaseManager())
@@ -0,0 +1,60 @@
+"""Tests for the transactional writes in python/db/operations.py."""
+
+import pandas as pd
+
+
+def fetch(db_ops, sql):
+    with db_ops.db_manager.get_connection(read_only=True) as conn:
+        return conn.execute(sql).fetchall()
+
+
+def existing_table(db_ops):
+    with db_ops.db_manager.get_connection() as conn:
+        conn.execute("CREATE TABLE records (record_id INTEGER, value INTEGER)")
+        conn.execute("INSERT INTO records VALUES (1, 10), (2, 20)")
+
+
+def test_insert_dataframe_appends_all_chunks(db_ops):
+    existing_table(db_ops)
+    df = pd.DataFrame({"record_id": range(3, 8), "value": range(30, 80, 10)})
+
+    assert db_ops.insert_dataframe(df, "records", chunk_size=2)
+
+    assert fetch(db_ops, "SELECT COUNT(*), SUM(value) FROM records") == [(7, 280)]
+
+
+def test_insert_dataframe_rolls_back_replace_on_failed_chunk(db_ops):
+    existing_table(db_ops)
+    # The second chunk cannot be cast to the INTEGER column created from the first
+    df = pd.DataFrame({"record_id": [3, 4, 5], "value": pd.Series([30, 40, "bad"], dtype=object)})
+
+    assert not db_ops.insert_dataframe(df, "records", if_exists="replace", chunk_size=2)
+
+    assert fetch(db_ops, "SELECT * FROM records ORDER BY record_id") == [(1, 10), (2, 20)]
+
+
+def test_upsert_data_replaces_matching_keys(db_ops):
+    existing_table(db_ops)
+    df = pd.DataFrame({"record_id": [2, 3], "value": [21, 30]})
+
+    assert db_ops.upsert_data(df, "records", key_columns=["record_id"])
+
+    assert fetch(db_ops, "SELECT * FROM records ORDER BY record_id") == [(1, 10), (2, 21), (3, 30)]
+
+
+def test_upsert_data_creates_missing_table(db_ops):
+    df = pd.DataFrame({"record_id": [1], "value": [10]})
+
+    assert db_ops.upsert_data(df, "records", key_columns=["record_id"])
+
+    assert fetch(db_ops, "SELECT * FROM records") == [(1, 10)]
+
+
+def test_upsert_data_keeps_rows_when_insert_fails(db_ops):
+    existing_table(db_ops)
+    # Matches record 2, but the extra column makes the INSERT fail after the DELETE
+    df = pd.DataFrame({"record_id": [2], "value": [21], "extra": [1]})
+
+    assert not db_ops.upsert_data(df, "records", key_columns=["record_id"])
+
+    assert fetch(db_ops, "SELECT * FROM records ORDER BY record_id") == [(1, 10), (2, 20)]
@@ -0,0 +1,21 @@
+"""Tests for pipelines/python/generate_metadata.py."""
+
+import pytest
+
+import generate_metadata
+from generate_metadata import encode_json
+
+
+def test_encode_json_is_compact_and_unescaped():
+    assert encode_json({"1": "Niño", "2": "No"}) == '{"1":"Niño","2":"No"}'
+
+
+@pytest.mark.parametrize("value", [
+    {"1": "Yes", "0": "No"},
+    {1: 120, 2: 35},
+    {"Hispanic": 10, "Non-Hispanic": 200},
+    {"label": "Strongly agree, \"often\""},
+    {},
+])
+def test_encode_json_matches_stdlib_encoder(value):
+    assert encode_json(value) == generate_metadata._JSON_ENCODER.encode(value)
@@ -0,0 +1,162 @@
+"""Tests for python/imputation/helpers.py against a small imputation database."""
+
+import duckdb
+import pytest
+
+from python.imputation import helpers
+from python.imputation.config import get_n_imputations
+
+IMPUTED_VARIABLES = ['puma', 'phq2_interest', 'phq2_depressed', 'phq2_positive']
+
+
+@pytest.fixture
+def imputation_db(db_path):
+    """
+    Six ne25 records; records 1-2 have imputed values in every imputation,
+    records 3-6 are observed. Record 6 has no phq2_interest at all.
+    """
+    n_imputations = get_n_imputations()
+    conn = duckdb.connect(str(db_path))
+    conn.execute("""
+        CREATE TABLE ne25_transformed AS
+        SELECT * FROM (VALUES
+            (1, 1, NULL, NULL, NULL, NULL, 'White'),
+            (2, 2, NULL, NULL, NULL, NULL, 'Black'),
+            (3, 3, 100.0, 0.0, 1.0, 0.0, 'White'),
+            (4, 4, 200.0, 2.0, 2.0, 1.0, 'Hispanic'),
+            (5, 5, 100.0, 1.0, 0.0, 0.0, 'White'),
+            (6, 6, 300.0, NULL, NULL, NULL, 'Black')
+        ) t(pid, record_id, puma, phq2_interest, phq2_depressed, phq2_positive, a1_raceG)
+    """)
+    for var, sql_type, expr in [
+        ('puma', 'DOUBLE', '100.0 * m'),
+        ('phq2_interest', 'TINYINT', 'm % 4'),
+        ('phq2_depressed', 'TINYINT', '(m + 1) % 4'),
+        ('phq2_positive', 'TINYINT', 'CASE WHEN m % 4 + (m + 1) % 4 >= 3 THEN 1 ELSE 0 END'),
+    ]:
+        conn.execute(f"""
+            CREATE TABLE ne25_imputed_{var} (
+                study_id VARCHAR, pid INTEGER, record_id INTEGER,
+                imputation_m INTEGER, {var} {sql_type}
+            )
+        """)
+        conn.execute(f"""
+            INSERT INTO ne25_imputed_{var}
+            SELECT 'ne25', r, r, m, {expr}
+            FROM range(1, 3) a(r), range(1, {n_imputations + 1}) b(m)
+        """)
+    conn.execute("""
+        CREATE TABLE imputation_metadata (
+            study_id VARCHAR, variable_name VARCHAR, n_imputations INTEGER,
+            imputation_method VARCHAR, created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO imputation_metadata (study_id, variable_name, n_imputations, imputation_method) "
+        "VALUES ('ne25', ?, ?, 'cart')",
+        [[var, n_imputations] for var in IMPUTED_VARIABLES]
+    )
+    conn.close()
+    return db_path
+
+
+def execute(db_path, sql):
+    with duckdb.connect(str(db_path)) as conn:
+        conn.execute(sql)
+
+
+# validate_imputations / _VALIDATION_RULES
+
+def test_validate_imputations_passes_clean_tables(imputation_db):
+    results = helpers.validate_imputations('ne25')
+    assert results['issues'] == []
+    assert results['all_valid']
+    assert results['variables_checked'] == len(IMPUTED_VARIABLES)
+
+
+def test_validate_imputations_reports_rule_violations(imputation_db):
+    execute(imputation_db, "UPDATE ne25_imputed_phq2_interest SET phq2_interest = 5 WHERE pid = 1")
+    execute(imputation_db, "INSERT INTO ne25_imputed_puma VALUES ('ne25', 1, 1, 1, 999.0)")
+    execute(imputation_db, "DELETE FROM ne25_imputed_phq2_depressed WHERE imputation_m = 1")
+
+    results = helpers.validate_imputations('ne25')
+    issues = results['issues']
+
+    assert not results['all_valid']
+    n_imputations = get_n_imputations()
+    assert any(i.startswith('phq2_interest:') and 'values outside valid range (0-3)' in i for i in issues)
+    assert any(i.startswith('puma:') and 'duplicate' in i for i in issues)
+    assert f"phq2_depressed: Expected {n_imputations} imputations, found {n_imputations - 1}" in issues
+    assert any(i.startswith('phq2_positive:') and 'inconsistent positive screen' in i for i in issues)
+
+
+def test_validation_rules_cover_mental_health_items():
+    for var in ['phq2_interest', 'phq2_depressed', 'gad2_nervous', 'gad2_worry', 'q1502']:
+        assert helpers._VALIDATION_RULES[var][1] == "values outside valid range (0-3)"
+    assert helpers._VALIDATION_RULES['phq2_positive'] == helpers._BINARY_RULE
+
+
+# require_nonnull
+
+@pytest.mark.parametrize("include_observed", [True, False])
+def test_require_nonnull_matches_filtering_after_load(imputation_db, include_observed):
+    kwargs = dict(variables=['phq2_interest'], include_observed=include_observed)
+    full = helpers.get_completed_dataset(2, **kwargs)
+    filtered = helpers.get_completed_dataset(2, require_nonnull=['phq2_interest'], **kwargs)
+
+    expected = full[full['phq2_interest'].notna()]
+    assert sorted(filtered['record_id']) == sorted(expected['record_id'])
+    assert filtered['phq2_interest'].notna().all()
+
+
+def test_require_nonnull_on_observed_column(imputation_db):
+    df = helpers.get_completed_dataset(
+        1, variables=['puma'], base_columns=['phq2_depressed'], require_nonnull=['phq2_depressed']
+    )
+    assert sorted(df['record_id']) == [3, 4, 5]
+
+
+# Parquet cache for get_all_imputations
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setattr(helpers, 'IMPUTATION_CACHE_DIR', path)
+    return path
+
+
+def test_cache_round_trip(imputation_db, cache_dir, monkeypatch):
+    df = helpers.get_all_imputations(variables=['puma'], base_columns=[], use_cache=True)
+    assert len(list(cache_dir.glob('*.parquet'))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache miss")
+
+    monkeypatch.setattr(helpers, '_get_imputations_long', fail)
+    cached = helpers.get_all_imputations(variables=['puma'], base_columns=[], use_cache=True)
+    assert cached.equals(df)
+
+
+def test_cache_key_changes_with_base_table(imputation_db, cache_dir):
+    key_args = (['puma'], 'ne25_transformed', 'ne25', True, [])
+    before = helpers._imputations_cache_path(*key_args)
+
+    execute(imputation_db, "INSERT INTO ne25_transformed VALUES (7, 7, 100.0, 0.0, 0.0, 0.0, 'White')")
+    after_insert = helpers._imputations_cache_path(*key_args)
+
+    execute(imputation_db, "ALTER TABLE ne25_transformed ADD COLUMN extra INTEGER")
+    after_alter = helpers._imputations_cache_path(*key_args)
+
+    assert len({before, after_insert, after_alter}) == 3
+
+
+def test_cache_key_changes_when_imputations_are_reinserted(imputation_db, cache_dir):
+    key_args = (['puma'], 'ne25_transformed', 'ne25', True, [])
+    before = helpers._imputations_cache_path(*key_args)
+
+    execute(
+        imputation_db,
+        "UPDATE imputation_metadata SET created_date = created_date + INTERVAL 1 DAY "
+        "WHERE variable_name = 'puma'"
+    )
+    assert helpers._imputations_cache_path(*key_args) != before
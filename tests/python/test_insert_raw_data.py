@@ -0,0 +1,132 @@
+"""Tests for pipelines/python/insert_raw_data.py."""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
+
+from insert_raw_data import enum_casts, insert_dictionary_data, insert_raw_data
+
+
+def factor_table(value_type):
+    """Arrow table with one factor column whose levels are stored as value_type."""
+    levels = pa.array(["low", "mid", "high"], type=value_type)
+    factor = pa.DictionaryArray.from_arrays(pa.array([2, 0, 1, 0], type=pa.int32()), levels)
+    return pa.table({"id": [1, 2, 3, 4], "level": factor})
+
+
+@pytest.mark.parametrize("value_type", [pa.string(), pa.large_string()])
+def test_enum_casts_accepts_string_dictionaries(value_type):
+    casts = enum_casts(factor_table(value_type))
+    assert casts == {"level": "CAST(\"level\" AS ENUM('low', 'mid', 'high'))"}
+
+
+def test_enum_casts_ignores_non_string_dictionaries():
+    codes = pa.DictionaryArray.from_arrays(pa.array([0, 1], type=pa.int32()), pa.array([10, 20]))
+    assert enum_casts(pa.table({"code": codes})) == {}
+
+
+@pytest.mark.parametrize("value_type", [pa.string(), pa.large_string()])
+def test_feather_factor_stored_as_enum(tmp_path, db_ops, value_type):
+    data_file = tmp_path / "raw.feather"
+    feather.write_feather(factor_table(value_type), data_file)
+
+    assert insert_raw_data(str(data_file), "raw_data", db_ops)
+
+    with db_ops.db_manager.get_connection(read_only=True) as conn:
+        column_type = conn.execute(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'raw_data' AND column_name = 'level'"
+        ).fetchone()[0]
+        values = [row[0] for row in conn.execute("SELECT level FROM raw_data ORDER BY id").fetchall()]
+
+    assert column_type == "ENUM('low', 'mid', 'high')"
+    assert values == ["high", "low", "mid", "low"]
+
+
+def fetch(db_ops, sql):
+    with db_ops.db_manager.get_connection(read_only=True) as conn:
+        return conn.execute(sql).fetchall()
+
+
+def column_types(db_ops, table_name):
+    return dict(fetch(
+        db_ops,
+        "SELECT column_name, data_type FROM information_schema.columns "
+        f"WHERE table_name = '{table_name}' ORDER BY ordinal_position"
+    ))
+
+
+@pytest.mark.parametrize("use_pandas", [False, True])
+def test_csv_insert(tmp_path, db_ops, use_pandas):
+    data_file = tmp_path / "raw.csv"
+    data_file.write_text("record_id,age,name\n1,30,a\n2,,b\n")
+
+    assert insert_raw_data(str(data_file), "raw_data", db_ops, use_pandas=use_pandas)
+
+    assert fetch(db_ops, "SELECT record_id, age, name FROM raw_data ORDER BY record_id") == [
+        (1, 30, "a"), (2, None, "b")
+    ]
+
+
+@pytest.mark.parametrize("use_pandas", [False, True])
+def test_header_only_csv_leaves_table_untouched(tmp_path, db_ops, use_pandas):
+    data_file = tmp_path / "raw.csv"
+    data_file.write_text("record_id,age\n1,30\n")
+    assert insert_raw_data(str(data_file), "raw_data", db_ops)
+
+    empty_file = tmp_path / "empty.csv"
+    empty_file.write_text("record_id,age\n")
+    assert insert_raw_data(str(empty_file), "raw_data", db_ops, use_pandas=use_pandas)
+
+    assert fetch(db_ops, "SELECT record_id, age FROM raw_data") == [(1, 30)]
+
+
+def test_parquet_insert_keeps_types_and_factors(tmp_path, db_ops):
+    table = factor_table(pa.large_string()).append_column(
+        "score", pa.array([1.5, None, 2.0, 3.0])
+    )
+    data_file = tmp_path / "raw.parquet"
+    pq.write_table(table, data_file)
+
+    assert insert_raw_data(str(data_file), "raw_data", db_ops)
+
+    assert column_types(db_ops, "raw_data") == {
+        "id": "BIGINT", "level": "ENUM('low', 'mid', 'high')", "score": "DOUBLE"
+    }
+    assert fetch(db_ops, "SELECT level, score FROM raw_data ORDER BY id")[:2] == [
+        ("high", 1.5), ("low", None)
+    ]
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".feather", ".parquet"])
+def test_dictionary_insert_sets_pid(tmp_path, db_ops, suffix):
+    dictionary = pd.DataFrame({
+        "field_name": ["age", "sex"],
+        "field_label": ["Age", "Sex"],
+    })
+    dict_file = tmp_path / f"dict{suffix}"
+    if suffix == ".csv":
+        dictionary.to_csv(dict_file, index=False)
+    elif suffix == ".feather":
+        dictionary.to_feather(dict_file)
+    else:
+        dictionary.to_parquet(dict_file)
+
+    assert insert_dictionary_data(str(dict_file), "dictionary", db_ops, 7679)
+
+    assert list(column_types(db_ops, "dictionary")) == ["field_name", "field_label", "pid", "created_at"]
+    assert fetch(db_ops, "SELECT field_name, pid FROM dictionary ORDER BY field_name") == [
+        ("age", 7679), ("sex", 7679)
+    ]
+
+
+def test_dictionary_insert_overwrites_existing_pid(tmp_path, db_ops):
+    dict_file = tmp_path / "dict.feather"
+    pd.DataFrame({"pid": [1], "field_name": ["age"]}).to_feather(dict_file)
+
+    assert insert_dictionary_data(str(dict_file), "dictionary", db_ops, 7679)
+
+    assert list(column_types(db_ops, "dictionary")) == ["pid", "field_name", "created_at"]
+    assert fetch(db_ops, "SELECT pid FROM dictionary") == [(7679,)]